@@ -0,0 +1,205 @@
+# benchmark.py
+"""Microbenchmarks for the memory reader, object walk and decoders.
+
+Runs against synthetic memory images, so no client is needed:
+
+    python benchmark.py --sizes 10 100 1000 5000 --repeat 50
+
+For each population size it reports throughput, backend reads (syscalls on a
+live process) per call, peak traced allocation per call and latency
+percentiles. Save a run with --save-baseline and later compare against it
+with --baseline; the run exits non-zero when any benchmark issues more reads,
+or its median latency or peak allocation grows by more than --max-regression:
+
+    python benchmark.py --sizes 100 1000 --save-baseline baseline.json
+    python benchmark.py --sizes 100 1000 --baseline baseline.json --max-regression 0.2
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+import tracemalloc
+
+from memory_reader import WoWMemoryReader, MemoryBackend
+from object_manager import ObjectManager
+from player_scan import PlayerScan
+from spellsystem import SpellCollection
+from synthetic_image import Scenario, build_image
+
+
+class CountingBackend(MemoryBackend):
+    """Wraps a backend and counts the reads issued through it."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.base_address = backend.base_address
+        self.process_id = backend.process_id
+        self.reads = 0
+        self.bytes_read = 0
+
+    def read_bytes(self, address, size):
+        self.reads += 1
+        self.bytes_read += size
+        return self.backend.read_bytes(address, size)
+
+    def read_into(self, address, buffer):
+        self.reads += 1
+        self.bytes_read += memoryview(buffer).nbytes
+        return self.backend.read_into(address, buffer)
+
+    @property
+    def vectored(self):
+        return self.backend.vectored
+
+    def read_vectors(self, ranges):
+        # One syscall only when the backend is truly vectored; otherwise one per range
+        self.reads += 1 if self.backend.vectored else len(ranges)
+        self.bytes_read += sum(memoryview(buffer).nbytes for _, buffer in ranges)
+        return self.backend.read_vectors(ranges)
+
+    def write_bytes(self, address, data):
+        return self.backend.write_bytes(address, data)
+
+    def reset(self):
+        self.reads = 0
+        self.bytes_read = 0
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def measure(name, backend, func, repeat, operations=1):
+    """Times func repeat times and returns a result row."""
+    func()  # Warm up caches and lazily compiled structs
+    timings = []
+    backend.reset()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    reads = backend.reads / repeat
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = sum(timings)
+    return {
+        'name': name,
+        'ops_per_sec': operations * repeat / total if total else float('inf'),
+        'reads': reads,
+        'peak_kib': peak / 1024,
+        'p50': percentile(timings, 0.50),
+        'p95': percentile(timings, 0.95),
+        'p99': percentile(timings, 0.99),
+    }
+
+
+def scenario_for(size):
+    """A crowded-zone scenario: one player in ten, a full party and some cooldowns."""
+    players = max(5, size // 10)
+    return Scenario(players=players, npcs=max(0, size - players), party=4,
+                    known_spells=range(1, 201),
+                    cooldowns=[(spell_id, 0, 1500) for spell_id in range(1, 41)])
+
+
+def run(sizes, repeat):
+    results = []
+    for size in sizes:
+        image = build_image(scenario_for(size))
+        backend = CountingBackend(image.backend)
+        reader = WoWMemoryReader(backend=backend)
+        first_object = image.first_object
+
+        def typed_reads():
+            for i in range(1000):
+                reader.read_uint(first_object)
+
+        manager = ObjectManager(reader)
+        incremental = ObjectManager(reader, incremental=True)
+        scan = PlayerScan(reader)
+        spells = SpellCollection(reader)
+        cached_reader = WoWMemoryReader(backend=backend, page_cache=True)
+        cached_manager = ObjectManager(cached_reader)
+
+        def cached_refresh():
+            cached_reader.begin_tick()
+            cached_manager.enum_visible_objects()
+
+        def party_health():
+            scan.begin_tick()
+            scan.get_party_health()
+
+        results.append((size, measure('read_uint', backend, typed_reads, repeat, operations=1000)))
+        results.append((size, measure('enum_visible_objects', backend, manager.enum_visible_objects, repeat)))
+        results.append((size, measure('enum_visible_objects (incremental)', backend,
+                                      incremental.enum_visible_objects, repeat)))
+        results.append((size, measure('enum_visible_objects (page cache)', backend, cached_refresh, repeat)))
+        results.append((size, measure('PlayerScan.ping', backend, scan.ping, repeat)))
+        results.append((size, measure('get_party_health', backend, party_health, repeat)))
+        results.append((size, measure('is_spell_ready', backend, lambda: spells.is_spell_ready(40), repeat)))
+    return results
+
+
+def report(results):
+    print(f"{'objects':>7}  {'benchmark':<36} {'ops/s':>12} {'reads':>9} {'peak KiB':>9} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for size, row in results:
+        print(f"{size:>7}  {row['name']:<36} {row['ops_per_sec']:>12.1f} {row['reads']:>9.1f} "
+              f"{row['peak_kib']:>9.1f} {row['p50'] * 1000:>9.3f} {row['p95'] * 1000:>9.3f} "
+              f"{row['p99'] * 1000:>9.3f}")
+
+
+def save_baseline(results, path):
+    """Writes results to path as JSON, keyed by population size and benchmark name."""
+    rows = {f"{size}:{row['name']}": row for size, row in results}
+    with open(path, 'w') as f:
+        json.dump(rows, f, indent=2, sort_keys=True)
+
+
+def compare(results, path, max_regression):
+    """Returns one message per benchmark that regressed against the baseline at path.
+
+    Read counts are deterministic, so any increase is a regression; median
+    latency and peak allocation may grow by up to max_regression (a fraction).
+    """
+    with open(path) as f:
+        baseline = json.load(f)
+    regressions = []
+    for size, row in results:
+        key = f"{size}:{row['name']}"
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if row['reads'] > base['reads']:
+            regressions.append(f"{key}: reads {base['reads']:.1f} -> {row['reads']:.1f}")
+        if row['p50'] > base['p50'] * (1 + max_regression):
+            regressions.append(f"{key}: p50 {base['p50'] * 1000:.3f} ms -> {row['p50'] * 1000:.3f} ms")
+        if row['peak_kib'] > base['peak_kib'] * (1 + max_regression) + 1:
+            regressions.append(f"{key}: peak KiB {base['peak_kib']:.1f} -> {row['peak_kib']:.1f}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark memory reads against synthetic images.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 5000])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--save-baseline', metavar='PATH', help="write the results to PATH as JSON")
+    parser.add_argument('--baseline', metavar='PATH', help="compare against a saved baseline")
+    parser.add_argument('--max-regression', type=float, default=0.2,
+                        help="allowed p50 / peak allocation growth as a fraction (default 0.2)")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    results = run(args.sizes, args.repeat)
+    report(results)
+    if args.save_baseline:
+        save_baseline(results, args.save_baseline)
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.max_regression)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
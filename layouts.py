@@ -0,0 +1,123 @@
+import struct
+from collections import namedtuple
+from offsets import Offsets
+
+# Field formats for Offsets.ObjectOffsets; every other table defaults to 'i'
+OBJECT_FIELD_FORMATS = {
+    "Guid": 'Q',
+    "Type": 'i',
+    "Pos_X": 'f',
+    "Pos_Y": 'f',
+    "Pos_Z": 'f',
+    "Rot": 'f',
+    "UnitFields": 'I',
+}
+
+UNIT_OFFSET_FORMATS = {
+    "SummonedBy": 'Q',
+}
+
+# EUnitFields slots holding a 64-bit guid or a float rather than an int
+UNIT_GUID_FIELDS = {
+    "UNIT_FIELD_CHARM", "UNIT_FIELD_SUMMON", "UNIT_FIELD_CRITTER",
+    "UNIT_FIELD_CHARMEDBY", "UNIT_FIELD_SUMMONEDBY", "UNIT_FIELD_CREATEDBY",
+    "UNIT_FIELD_TARGET", "UNIT_FIELD_CHANNEL_OBJECT",
+}
+UNIT_FLOAT_FIELDS = {
+    "UNIT_FIELD_BOUNDINGRADIUS", "UNIT_FIELD_COMBATREACH",
+    "UNIT_FIELD_MINDAMAGE", "UNIT_FIELD_MAXDAMAGE",
+    "UNIT_FIELD_MINOFFHANDDAMAGE", "UNIT_FIELD_MAXOFFHANDDAMAGE",
+    "UNIT_MOD_CAST_SPEED", "UNIT_FIELD_ATTACK_POWER_MULTIPLIER",
+    "UNIT_FIELD_RANGED_ATTACK_POWER_MULTIPLIER",
+    "UNIT_FIELD_MINRANGEDDAMAGE", "UNIT_FIELD_MAXRANGEDDAMAGE",
+    "UNIT_FIELD_MAXHEALTHMODIFIER", "UNIT_FIELD_HOVERHEIGHT",
+}
+
+
+class RecordLayout:
+    """A fixed-offset record compiled into a single struct.Struct.
+
+    Fields are (name, offset, fmt) triples. Gaps between fields become pad
+    bytes, so unpack_from decodes the whole record from a buffer in one call.
+    """
+
+    def __init__(self, name, fields):
+        fields = sorted(fields, key=lambda field: field[1])
+        fmt = '<'
+        position = 0
+        for field_name, offset, field_fmt in fields:
+            if offset < position:
+                raise ValueError(f"{name}.{field_name} at {hex(offset)} overlaps the previous field")
+            if offset > position:
+                fmt += f'{offset - position}x'
+            fmt += field_fmt
+            position = offset + struct.calcsize('<' + field_fmt)
+
+        self.name = name
+        self.fields = fields
+        self.offsets = {field_name: offset for field_name, offset, _ in fields}
+        self.struct = struct.Struct(fmt)
+        self.size = self.struct.size
+        self.record = namedtuple(name, [field_name for field_name, _, _ in fields])
+
+    def unpack_from(self, buffer, offset=0):
+        """Decodes every field as a plain tuple in offset order."""
+        return self.struct.unpack_from(buffer, offset)
+
+    def decode(self, buffer, offset=0):
+        """Decodes every field into a named record."""
+        return self.record._make(self.struct.unpack_from(buffer, offset))
+
+
+def _field_name(key):
+    for prefix in ("UNIT_FIELD_", "UNIT_"):
+        if key.startswith(prefix):
+            key = key[len(prefix):]
+            break
+    return key.lower()
+
+
+def compile_offsets_class(name, offsets_class, formats, default_fmt='i'):
+    """Compiles a class of NAME = offset attributes (e.g. Offsets.ObjectOffsets)."""
+    fields = [
+        (key.lower(), offset, formats.get(key, default_fmt))
+        for key, offset in vars(offsets_class).items()
+        if not key.startswith('_')
+    ]
+    return RecordLayout(name, fields)
+
+
+def compile_descriptor_fields(name, descriptor_fields, end_key):
+    """Compiles a descriptor dictionary (e.g. Offsets.EUnitFields) of 4-byte slot indices.
+
+    Every slot before end_key becomes a field; multi-slot entries decode their
+    first slot, or the whole 64-bit value for guid fields.
+    """
+    end = descriptor_fields[end_key]
+    fields = []
+    for key, slot in descriptor_fields.items():
+        if slot >= end:
+            continue
+        if key in UNIT_GUID_FIELDS:
+            fmt = 'Q'
+        elif key in UNIT_FLOAT_FIELDS:
+            fmt = 'f'
+        else:
+            fmt = 'i'
+        fields.append((_field_name(key), slot * 4, fmt))
+    layout = RecordLayout(name, fields)
+    if layout.size > end * 4:
+        raise ValueError(f"{name} runs past {end_key}")
+    return layout
+
+
+OBJECT_LAYOUT = compile_offsets_class("ObjectRecord", Offsets.ObjectOffsets, OBJECT_FIELD_FORMATS)
+UNIT_LAYOUT = compile_offsets_class("UnitRecord", Offsets.UnitOffsets, UNIT_OFFSET_FORMATS)
+UNIT_FIELDS_LAYOUT = compile_descriptor_fields("UnitFieldsRecord", Offsets.EUnitFields, "UNIT_FIELD_PADDING")
+
+# The handful of node fields needed to walk and index the object list
+NODE_LAYOUT = RecordLayout("ObjectNode", [
+    ("type", Offsets.ObjectOffsets.Type, 'i'),
+    ("guid", Offsets.ObjectOffsets.Guid, 'Q'),
+    ("next", Offsets.ObjectManager.NextObjectOffset, 'I'),
+])
@@ -1,4 +1,5 @@
-from typing import Any, Optional, Callable
+from typing import Any, Optional, Callable, List, Sequence
+from collections import Counter, OrderedDict
 import ctypes
 from enum import IntEnum
 
@@ -25,6 +26,9 @@ class LuaInterface:
     LuaToNumber = 0x0084E030
     LuaToLString = 0x0084E0E0
     LuaToBoolean = 0x0084E0B0
+    LuaRawGetI = 0x0084E670
+    LuaRawSetI = 0x0084EAB0
+    LuaNext = 0x0084EF50
     Lua_DoString = 0x00819210
     Lua_GetLocalizedText = 0x007225E0
     Lua_SetTop = 0x000084DBF0
@@ -35,86 +39,148 @@ class LuaInterface:
     FrameScript_UnregisterFunction = 0x00817FD0
     FrameScript_SignalEvent = 0x0081AC90
 
+# Pseudo-index of the Lua registry and "return every result" for lua_pcall
+LUA_REGISTRYINDEX = -10000
+LUA_MULTRET = -1
+# Nested tables deeper than this decode as None (guards against cycles)
+LUA_TABLE_MAX_DEPTH = 8
+# Key types get_table can turn into distinct Python keys; booleans are left out
+# because True == 1 in Python, so [true] and [1] would overwrite each other
+LUA_KEY_TYPES = (LuaType.LUA_TNUMBER, LuaType.LUA_TSTRING)
+# Registry keys used for cached chunks, far above the keys luaL_ref hands out
+CHUNK_REF_BASE = 0x50590000
+
+# Signature of a C function callable from Lua: int (*)(lua_State *L)
+lua_CFunction = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p)
+
+# Entry point -> (address, restype, argtypes...), bound once per LuaFunctions
+LUA_PROTOTYPES = {
+    'gettop': (LuaInterface.LuaGetTop, ctypes.c_int, ctypes.c_void_p),
+    'settop': (LuaInterface.LuaSetTop, None, ctypes.c_void_p, ctypes.c_int),
+    'pushstring': (LuaInterface.FrameScript__PushString, None, ctypes.c_void_p, ctypes.c_char_p),
+    'pushinteger': (LuaInterface.FrameScript_pushinteger, None, ctypes.c_void_p, ctypes.c_int),
+    'pushboolean': (LuaInterface.FrameScript_pushboolean, None, ctypes.c_void_p, ctypes.c_int),
+    'pcall': (LuaInterface.LuaPCall, ctypes.c_int, ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_int),
+    'loadbuffer': (LuaInterface.LuaLoadBuffer, ctypes.c_int,
+                   ctypes.c_void_p, ctypes.c_char_p, ctypes.c_size_t, ctypes.c_char_p),
+    'type': (LuaInterface.LuaType, ctypes.c_int, ctypes.c_void_p, ctypes.c_int),
+    'tonumber': (LuaInterface.LuaToNumber, ctypes.c_double, ctypes.c_void_p, ctypes.c_int),
+    'tolstring': (LuaInterface.LuaToLString, ctypes.c_void_p,
+                  ctypes.c_void_p, ctypes.c_int, ctypes.POINTER(ctypes.c_size_t)),
+    'toboolean': (LuaInterface.LuaToBoolean, ctypes.c_int, ctypes.c_void_p, ctypes.c_int),
+    'rawgeti': (LuaInterface.LuaRawGetI, None, ctypes.c_void_p, ctypes.c_int, ctypes.c_int),
+    'rawseti': (LuaInterface.LuaRawSetI, None, ctypes.c_void_p, ctypes.c_int, ctypes.c_int),
+    'next': (LuaInterface.LuaNext, ctypes.c_int, ctypes.c_void_p, ctypes.c_int),
+    'dostring': (LuaInterface.Lua_DoString, ctypes.c_int, ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p),
+    'getlocalizedtext': (LuaInterface.Lua_GetLocalizedText, ctypes.c_char_p, ctypes.c_void_p, ctypes.c_char_p),
+    'registerfunction': (LuaInterface.FrameScript_RegisterFunction, None,
+                         ctypes.c_void_p, ctypes.c_char_p, ctypes.c_void_p),
+    'unregisterfunction': (LuaInterface.FrameScript_UnregisterFunction, None, ctypes.c_void_p, ctypes.c_char_p),
+    'signalevent': (LuaInterface.FrameScript_SignalEvent, None, ctypes.c_void_p, ctypes.c_char_p),
+}
+
+class LuaFunctions:
+    """Prebuilt function table: every LuaInterface entry point bound to its prototype once"""
+
+    def __init__(self) -> None:
+        for name, (address, restype, *argtypes) in LUA_PROTOTYPES.items():
+            setattr(self, name, ctypes.CFUNCTYPE(restype, *argtypes)(address))
+
 class LuaState:
     """Wrapper for Lua state pointer and core functions"""
     
-    def __init__(self) -> None:
+    def __init__(self, api: Optional[LuaFunctions] = None) -> None:
         self.L = ctypes.c_void_p(LuaInterface.LuaState)
+        self.api = api if api is not None else LuaFunctions()
+        self._length = ctypes.c_size_t()
+        # Debug aid: when set, LuaStackGuard counts slots left behind per call site
+        self.track_leaks = False
+        self.leaks = Counter()
 
     def lua_gettop(self) -> int:
-        return ctypes.cast(
-            LuaInterface.LuaGetTop,
-            ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p)
-        )(self.L)
+        return self.api.gettop(self.L)
 
     def lua_settop(self, index: int) -> None:
-        ctypes.cast(
-            LuaInterface.LuaSetTop,
-            ctypes.CFUNCTYPE(None, ctypes.c_void_p, ctypes.c_int)
-        )(self.L, index)
+        self.api.settop(self.L, index)
 
     def lua_pushstring(self, s: str) -> None:
-        ctypes.cast(
-            LuaInterface.FrameScript__PushString,
-            ctypes.CFUNCTYPE(None, ctypes.c_void_p, ctypes.c_char_p)
-        )(self.L, s.encode('utf-8'))
+        self.api.pushstring(self.L, s.encode('utf-8'))
 
     def lua_pcall(self, nargs: int, nresults: int, errfunc: int) -> int:
-        return ctypes.cast(
-            LuaInterface.LuaPCall,
-            ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_int)
-        )(self.L, nargs, nresults, errfunc)
+        return self.api.pcall(self.L, nargs, nresults, errfunc)
 
     def lua_type(self, index: int) -> int:
-        return ctypes.cast(
-            LuaInterface.LuaType,
-            ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_int)
-        )(self.L, index)
+        return self.api.type(self.L, index)
 
     def lua_tonumber(self, index: int) -> float:
-        return ctypes.cast(
-            LuaInterface.LuaToNumber,
-            ctypes.CFUNCTYPE(ctypes.c_double, ctypes.c_void_p, ctypes.c_int)
-        )(self.L, index)
+        return self.api.tonumber(self.L, index)
 
     def lua_tostring(self, index: int) -> str:
-        length = ctypes.c_size_t()
-        ptr = ctypes.cast(
-            LuaInterface.LuaToLString,
-            ctypes.CFUNCTYPE(ctypes.c_char_p, ctypes.c_void_p, ctypes.c_int, ctypes.POINTER(ctypes.c_size_t))
-        )(self.L, index, ctypes.byref(length))
-        return ptr[:length.value].decode('utf-8')
+        ptr = self.api.tolstring(self.L, index, ctypes.byref(self._length))
+        return ctypes.string_at(ptr, self._length.value).decode('utf-8') if ptr else None
 
     def lua_toboolean(self, index: int) -> bool:
-        return bool(ctypes.cast(
-            LuaInterface.LuaToBoolean,
-            ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_int)
-        )(self.L, index))
+        return bool(self.api.toboolean(self.L, index))
+
+class LuaStackGuard:
+    """Scoped Lua call: records gettop on entry and restores it on exit
+
+    Read the call's results with values() or result() inside the block. With
+    L.track_leaks set, any other slots still above the entry depth on exit
+    are added to L.leaks under the call site's name.
+    """
+
+    def __init__(self, L: LuaState, site: str) -> None:
+        self.L = L
+        self.site = site
+        self.top = 0
+        self.consumed = 0
+
+    def __enter__(self) -> 'LuaStackGuard':
+        self.top = self.L.lua_gettop()
+        return self
+
+    def values(self, limit: Optional[int] = None) -> List[Any]:
+        """Decode the slots pushed since entry (at most limit of them), bottom first"""
+        count = self.L.lua_gettop() - self.top
+        if limit is not None:
+            count = min(count, limit)
+        self.consumed = max(count, 0)
+        return LuaHelpers.get_values(self.L, self.top + 1, self.top + count)
+
+    def result(self) -> Any:
+        """Decode the topmost slot pushed since entry, or None if nothing was pushed"""
+        if self.L.lua_gettop() <= self.top:
+            return None
+        self.consumed = 1
+        return LuaHelpers.get_value(self.L, -1)
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self.L.track_leaks:
+            leaked = self.L.lua_gettop() - self.top - self.consumed
+            if leaked > 0:
+                self.L.leaks[self.site] += leaked
+        self.L.lua_settop(self.top)
 
 class LuaHelpers:
     """Helper functions for Lua value conversion"""
 
     @staticmethod
     def push_value(L: LuaState, val: Any) -> None:
+        # bool before int: bool is an int subclass and False must stay falsy in Lua
         if isinstance(val, str):
             L.lua_pushstring(val)
-        elif isinstance(val, int):
-            ctypes.cast(
-                LuaInterface.FrameScript_pushinteger,
-                ctypes.CFUNCTYPE(None, ctypes.c_void_p, ctypes.c_int)
-            )(L.L, val)
         elif isinstance(val, bool):
-            ctypes.cast(
-                LuaInterface.FrameScript_pushboolean,
-                ctypes.CFUNCTYPE(None, ctypes.c_void_p, ctypes.c_int)
-            )(L.L, int(val))
+            L.api.pushboolean(L.L, int(val))
+        elif isinstance(val, int):
+            L.api.pushinteger(L.L, val)
         elif val is None:
             L.lua_settop(L.lua_gettop() + 1)  # Push nil
         else:
             raise ValueError(f"Unsupported type: {type(val)}")
 
     @staticmethod
-    def get_value(L: LuaState, index: int) -> Any:
+    def get_value(L: LuaState, index: int, depth: int = 0) -> Any:
         lua_type = L.lua_type(index)
         if lua_type == LuaType.LUA_TNIL:
             return None
@@ -124,34 +190,208 @@ class LuaHelpers:
             return L.lua_tonumber(index)
         elif lua_type == LuaType.LUA_TSTRING:
             return L.lua_tostring(index)
+        elif lua_type == LuaType.LUA_TTABLE:
+            return LuaHelpers.get_table(L, index, depth)
         else:
             raise ValueError(f"Unsupported Lua type: {lua_type}")
 
+    @staticmethod
+    def get_values(L: LuaState, first: int, last: Optional[int] = None) -> List[Any]:
+        """Decode the stack slots first..last (default: the top), e.g. a call's multiple returns"""
+        if last is None:
+            last = L.lua_gettop()
+        return [LuaHelpers.get_value(L, i) for i in range(first, last + 1)]
+
+    @staticmethod
+    def get_table(L: LuaState, index: int, depth: int = 0) -> Any:
+        """Convert the table at index in one lua_next traversal
+
+        A table whose keys are exactly 1..n becomes a list, anything else a
+        dict. Integral number keys become ints. Entries whose key is not a
+        string or number are skipped: booleans (they would collide with 1
+        and 0) and tables such as frames, functions or userdata. Values of
+        unsupported types are skipped too.
+        """
+        if depth >= LUA_TABLE_MAX_DEPTH:
+            return None
+        if LUA_REGISTRYINDEX < index < 0:
+            index = L.lua_gettop() + index + 1  # Keys pushed below would shift a relative index
+        items = {}
+        LuaHelpers.push_value(L, None)  # First key
+        while L.api.next(L.L, index):
+            # Key at -2, value at -1; keys are decoded by type, never converted in place
+            if L.lua_type(-2) in LUA_KEY_TYPES:
+                key = LuaHelpers.get_value(L, -2, depth + 1)
+                if isinstance(key, float) and key.is_integer():
+                    key = int(key)
+                try:
+                    items[key] = LuaHelpers.get_value(L, -1, depth + 1)
+                except ValueError:
+                    pass
+            L.lua_settop(-2)  # Pop the value, keep the key for the next step
+        if items and all(type(key) is int for key in items) and \
+                min(items) == 1 and max(items) == len(items):
+            return [items[i] for i in range(1, len(items) + 1)]
+        return items
+
+    @staticmethod
+    def build_batch(snippets: Sequence[str]) -> str:
+        """Wrap snippets into one chunk returning each snippet's first result as its own value
+
+        Each snippet runs in its own pcall, so a runtime error yields nil for
+        that slot only; a syntax error still fails the whole chunk.
+        """
+        lines = ["local r = {}"]
+        for i, snippet in enumerate(snippets, 1):
+            lines.append(f"do local ok, v = pcall(function() {snippet}\nend) if ok then r[{i}] = v end end")
+        lines.append(f"return unpack(r, 1, {len(snippets)})")
+        return "\n".join(lines)
+
     @staticmethod
     def do_string(L: LuaState, code: str) -> Any:
-        ctypes.cast(
-            LuaInterface.Lua_DoString,
-            ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p)
-        )(L.L, code.encode('utf-8'), b"LuaHelpers.do_string")
-        return LuaHelpers.get_value(L, -1)
+        with LuaStackGuard(L, "do_string") as guard:
+            L.api.dostring(L.L, code.encode('utf-8'), b"LuaHelpers.do_string")
+            return guard.result()
+
+class LuaChunkCache:
+    """Compiled chunks kept in the Lua registry, least recently used evicted first
+
+    A chunk is compiled once with LuaLoadBuffer and stored under its own
+    registry key; later calls fetch it with lua_rawgeti and run it with
+    LuaPCall, so the source is only parsed again if the entry stops being a
+    function (the registry was reset or the key was overwritten).
+    """
+
+    def __init__(self, L: LuaState, capacity: int = 64) -> None:
+        self.L = L
+        self.capacity = capacity
+        self.refs = OrderedDict()
+        self.free_refs = []
+        self.next_ref = CHUNK_REF_BASE
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.refs)
+
+    def ref(self, code: str) -> int:
+        """Returns the registry key of code's compiled chunk, compiling it on first use"""
+        ref = self.refs.get(code)
+        if ref is not None:
+            self.refs.move_to_end(code)
+            self.hits += 1
+            return ref
+
+        L = self.L
+        source = code.encode('utf-8')
+        if L.api.loadbuffer(L.L, source, len(source), b"=WoWLuaEngine.chunk") != 0:
+            message = LuaHelpers.get_value(L, -1)
+            L.lua_settop(-2)
+            raise RuntimeError(f"Lua compile error: {message}")
+        ref = self.free_refs.pop() if self.free_refs else self._new_ref()
+        L.api.rawseti(L.L, LUA_REGISTRYINDEX, ref)  # Pops the compiled chunk
+        self.refs[code] = ref
+        self.misses += 1
+        if len(self.refs) > self.capacity:
+            self._release(self.refs.popitem(last=False)[1])
+        return ref
+
+    def _new_ref(self) -> int:
+        ref = self.next_ref
+        self.next_ref += 1
+        return ref
+
+    def _release(self, ref: int) -> None:
+        LuaHelpers.push_value(self.L, None)
+        self.L.api.rawseti(self.L.L, LUA_REGISTRYINDEX, ref)
+        self.free_refs.append(ref)
+
+    def call(self, code: str, *args: Any) -> Any:
+        """Runs code's cached chunk with args (visible to it as ...) and returns its first result"""
+        return self._call(code, args, 1)[0]
+
+    def call_multi(self, code: str, *args: Any) -> List[Any]:
+        """Like call, but returns every result of the chunk"""
+        return self._call(code, args, LUA_MULTRET)
+
+    def _call(self, code: str, args: Sequence[Any], nresults: int) -> List[Any]:
+        L = self.L
+        ref = self.ref(code)
+        with LuaStackGuard(L, "LuaChunkCache.call") as guard:
+            L.api.rawgeti(L.L, LUA_REGISTRYINDEX, ref)
+            if L.lua_type(-1) != LuaType.LUA_TFUNCTION:
+                # The slot was cleared or reused behind our back (e.g. a UI reload);
+                # abandon it rather than trusting it again and compile afresh
+                L.lua_settop(-2)
+                del self.refs[code]
+                L.api.rawgeti(L.L, LUA_REGISTRYINDEX, self.ref(code))
+                if L.lua_type(-1) != LuaType.LUA_TFUNCTION:
+                    raise RuntimeError("Lua chunk cache: registry entry is not a function")
+            for arg in args:
+                LuaHelpers.push_value(L, arg)
+            if L.lua_pcall(len(args), nresults, 0) != 0:
+                guard.consumed = 1
+                raise RuntimeError(f"Lua runtime error: {LuaHelpers.get_value(L, -1)}")
+            return guard.values()
+
+    def clear(self) -> None:
+        """Releases every cached chunk"""
+        while self.refs:
+            self._release(self.refs.popitem(last=False)[1])
 
 class WoWLuaEngine:
     """Main interface for WoW Lua execution"""
 
     def __init__(self) -> None:
+        # Binds every Lua entry point once; calls then go straight to the client
         self.lua_state = LuaState()
+        self.callbacks = {}
+        self.chunks = LuaChunkCache(self.lua_state)
 
     def execute_lua(self, code: str) -> Any:
         """Execute Lua code and return the result"""
         return LuaHelpers.do_string(self.lua_state, code)
 
+    def execute_cached(self, code: str, *args: Any) -> Any:
+        """Execute Lua code compiled once and cached; args are passed to it as ...
+
+        Use this for snippets polled every frame: unlike execute_lua, the
+        source is only parsed the first time.
+        """
+        return self.chunks.call(code, *args)
+
+    def execute_cached_multi(self, code: str, *args: Any) -> List[Any]:
+        """Like execute_cached, but returns every value the code returns
+
+        Returning a table decodes it too, so e.g. all raid members' health
+        can come back from a single call.
+        """
+        return self.chunks.call_multi(code, *args)
+
+    def execute_batch(self, snippets: Sequence[str]) -> List[Any]:
+        """Execute many snippets in one Lua_DoString round trip, one result per snippet
+
+        Snippets are written like execute_lua code ("return UnitHealth('player')").
+        The results come back as consecutive stack slots, are decoded in one
+        pass and popped again.
+        """
+        if not snippets:
+            return []
+        L = self.lua_state
+        with LuaStackGuard(L, "execute_batch") as guard:
+            L.api.dostring(L.L, LuaHelpers.build_batch(snippets).encode('utf-8'), b"WoWLuaEngine.execute_batch")
+            values = guard.values(len(snippets))
+        values.extend([None] * (len(snippets) - len(values)))
+        return values
+
     def get_localized_text(self, text_id: str) -> Optional[str]:
         """Get localized text by ID"""
-        ctypes.cast(
-            LuaInterface.Lua_GetLocalizedText,
-            ctypes.CFUNCTYPE(ctypes.c_char_p, ctypes.c_void_p, ctypes.c_char_p)
-        )(self.lua_state.L, text_id.encode('utf-8'))
-        return LuaHelpers.get_value(self.lua_state, -1)
+        with LuaStackGuard(self.lua_state, "get_localized_text") as guard:
+            text = self.lua_state.api.getlocalizedtext(self.lua_state.L, text_id.encode('utf-8'))
+            value = guard.result()
+        if value is not None:
+            return value
+        return text.decode('utf-8') if text else None
 
     def register_function(self, func_name: str, py_func: Callable) -> None:
         """Register a Python function to be called from Lua"""
@@ -166,25 +406,20 @@ class WoWLuaEngine:
                 print(f"Error in Lua wrapper: {e}")
                 return 0
 
-        c_func = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p)(lua_wrapper)
-        ctypes.cast(
-            LuaInterface.FrameScript_RegisterFunction,
-            ctypes.CFUNCTYPE(None, ctypes.c_void_p, ctypes.c_char_p, ctypes.c_void_p)
-        )(self.lua_state.L, func_name.encode('utf-8'), c_func)
+        c_func = lua_CFunction(lua_wrapper)
+        # The client keeps only the raw pointer; the callback must outlive the registration
+        self.callbacks[func_name] = c_func
+        self.lua_state.api.registerfunction(self.lua_state.L, func_name.encode('utf-8'), c_func)
 
     def unregister_function(self, func_name: str) -> None:
         """Unregister a previously registered function"""
-        ctypes.cast(
-            LuaInterface.FrameScript_UnregisterFunction,
-            ctypes.CFUNCTYPE(None, ctypes.c_void_p, ctypes.c_char_p)
-        )(self.lua_state.L, func_name.encode('utf-8'))
+        self.lua_state.api.unregisterfunction(self.lua_state.L, func_name.encode('utf-8'))
+        self.callbacks.pop(func_name, None)
 
     def signal_event(self, event_name: str, *args: Any) -> None:
         """Signal a WoW event with optional arguments"""
-        ctypes.cast(
-            LuaInterface.FrameScript_SignalEvent,
-            ctypes.CFUNCTYPE(None, ctypes.c_void_p, ctypes.c_char_p)
-        )(self.lua_state.L, event_name.encode('utf-8'))
-        for arg in args:
-            LuaHelpers.push_value(self.lua_state, arg)
-        self.lua_state.lua_pcall(len(args), 0, 0)
\ No newline at end of file
+        with LuaStackGuard(self.lua_state, "signal_event"):
+            self.lua_state.api.signalevent(self.lua_state.L, event_name.encode('utf-8'))
+            for arg in args:
+                LuaHelpers.push_value(self.lua_state, arg)
+            self.lua_state.lua_pcall(len(args), 0, 0)
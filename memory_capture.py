@@ -0,0 +1,243 @@
+"""Capture the memory pages a session touches and replay them offline.
+
+A capture file holds every distinct page content once (zlib-compressed and
+deduplicated by hash) plus, per tick, a map of page address -> content.
+RecordingBackend writes one while wrapping a live backend; ReplayBackend
+serves reads from it via mmap, so a busy session can be reproduced and
+different reader or walker versions compared on identical data.
+
+Layout: header, then a stream of records. A blob record holds one
+compressed content; a tick record lists the pages (and the exact ranges of
+reads that could not be captured as whole pages) touched in that tick.
+Each tick record is flushed as the tick ends, so a session that never
+reaches close() still replays up to its last completed tick.
+"""
+import atexit
+import hashlib
+import mmap
+import struct
+import zlib
+
+from memory_reader import MemoryBackend, MemoryReadError, MemoryWriteError, PAGE_SIZE
+
+CAPTURE_MAGIC = b'WOWCAP1\0'
+_HEADER = struct.Struct('<8sIIQI')   # magic, version, page size, base address, process id
+_BLOB = struct.Struct('<cI')         # b'B', compressed length; the data follows
+_TICK = struct.Struct('<cII')        # b'T', pages, ranges recorded in the tick
+_PAGE = struct.Struct('<QI')         # page address, blob id
+_RANGE = struct.Struct('<QII')       # read address, size, blob id
+CAPTURE_VERSION = 2
+
+
+class RecordingBackend(MemoryBackend):
+    """Wraps a backend and records every page touched, one page map per tick.
+
+    The first read that touches a page in a tick fetches the whole page and
+    the rest of that tick is served from the captured copy, so a replay sees
+    exactly what the recorded session saw. A read whose pages cannot be
+    fetched whole is passed through and its exact range recorded instead.
+    The capture is closed at interpreter exit if close() was never called.
+    """
+
+    def __init__(self, backend, path, compression_level=1):
+        self.backend = backend
+        self.base_address = backend.base_address
+        self.process_id = backend.process_id
+        self.pm = getattr(backend, 'pm', None)
+        self.compression_level = compression_level
+        self.file = open(path, 'wb')
+        self.file.write(_HEADER.pack(CAPTURE_MAGIC, CAPTURE_VERSION, PAGE_SIZE,
+                                     self.base_address, self.process_id))
+        self.blob_count = 0
+        self.blob_ids = {}
+        self.tick_count = 0
+        self.pages = {}
+        self.page_blobs = {}
+        self.ranges = {}
+        atexit.register(self.close)
+
+    def _page(self, page):
+        data = self.pages.get(page)
+        if data is None:
+            data = self.backend.read_bytes(page, PAGE_SIZE)
+            self.pages[page] = data
+            self.page_blobs[page] = self._store(data)
+        return data
+
+    def _store(self, data):
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        blob_id = self.blob_ids.get(digest)
+        if blob_id is None:
+            compressed = zlib.compress(data, self.compression_level)
+            blob_id = self.blob_ids[digest] = self.blob_count
+            self.blob_count += 1
+            self.file.write(_BLOB.pack(b'B', len(compressed)))
+            self.file.write(compressed)
+        return blob_id
+
+    def read_bytes(self, address, size):
+        first = address & ~(PAGE_SIZE - 1)
+        try:
+            if address + size <= first + PAGE_SIZE:
+                offset = address - first
+                return self._page(first)[offset:offset + size]
+            chunks = []
+            page = first
+            while page < address + size:
+                chunks.append(self._page(page))
+                page += PAGE_SIZE
+        except MemoryReadError:
+            data = self.backend.read_bytes(address, size)
+            recorded = self.ranges.get(address)
+            if recorded is None or recorded[0] <= size:
+                self.ranges[address] = (size, self._store(data))
+            return data
+        offset = address - first
+        return b''.join(chunks)[offset:offset + size]
+
+    def write_bytes(self, address, data):
+        self.backend.write_bytes(address, data)
+        # Re-capture the written pages on their next read
+        page = address & ~(PAGE_SIZE - 1)
+        while page < address + len(data):
+            self.pages.pop(page, None)
+            page += PAGE_SIZE
+
+    def begin_tick(self):
+        """Writes and flushes the current tick's page map and starts the next one."""
+        self.file.write(_TICK.pack(b'T', len(self.page_blobs), len(self.ranges)))
+        for page, blob_id in self.page_blobs.items():
+            self.file.write(_PAGE.pack(page, blob_id))
+        for address, (size, blob_id) in self.ranges.items():
+            self.file.write(_RANGE.pack(address, size, blob_id))
+        self.file.flush()
+        self.tick_count += 1
+        self.pages = {}
+        self.page_blobs = {}
+        self.ranges = {}
+
+    def close(self):
+        """Writes the final tick and closes the file."""
+        if self.file.closed:
+            return
+        self.begin_tick()
+        self.file.close()
+        atexit.unregister(self.close)
+
+
+class ReplayBackend(MemoryBackend):
+    """Serves reads from a capture file, one recorded tick at a time.
+
+    begin_tick() advances to the next recorded tick. A page not recorded in
+    the current tick falls back to its most recent earlier capture, and so
+    does a range recorded in place of unreadable pages; anything never
+    captured raises MemoryReadError. A truncated trailing record (the
+    recording process died mid-tick) is ignored. Writes are rejected.
+    """
+
+    def __init__(self, path, cache_pages=4096):
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, page_size, self.base_address, self.process_id = _HEADER.unpack_from(self.data, 0)
+        if magic != CAPTURE_MAGIC or version != CAPTURE_VERSION:
+            raise ValueError(f"{path} is not a version {CAPTURE_VERSION} capture file")
+        if page_size != PAGE_SIZE:
+            raise ValueError(f"Unsupported capture page size {page_size}")
+
+        self.blobs = []
+        self.ticks = []
+        data = self.data
+        end = len(data)
+        offset = _HEADER.size
+        while offset < end:
+            tag = data[offset:offset + 1]
+            if tag == b'B' and offset + _BLOB.size <= end:
+                _, length = _BLOB.unpack_from(data, offset)
+                start = offset + _BLOB.size
+                if start + length > end:
+                    break
+                self.blobs.append((start, length))
+                offset = start + length
+            elif tag == b'T' and offset + _TICK.size <= end:
+                _, page_count, range_count = _TICK.unpack_from(data, offset)
+                start = offset + _TICK.size
+                offset = start + page_count * _PAGE.size + range_count * _RANGE.size
+                if offset > end:
+                    break
+                pages = dict(_PAGE.iter_unpack(data[start:start + page_count * _PAGE.size]))
+                ranges = {address: (size, blob_id) for address, size, blob_id
+                          in _RANGE.iter_unpack(data[start + page_count * _PAGE.size:offset])}
+                self.ticks.append((pages, ranges))
+            else:
+                break  # Truncated by an interrupted recording
+
+        self.cache_pages = cache_pages
+        self.cache = {}
+        self.tick = 0
+        self.page_map = dict(self.ticks[0][0]) if self.ticks else {}
+        self.range_map = dict(self.ticks[0][1]) if self.ticks else {}
+
+    @property
+    def tick_count(self):
+        return len(self.ticks)
+
+    def seek(self, tick):
+        """Positions the replay at a recorded tick."""
+        if not 0 <= tick < len(self.ticks):
+            raise IndexError(f"Capture has {len(self.ticks)} ticks")
+        page_map = {}
+        range_map = {}
+        for pages, ranges in self.ticks[:tick + 1]:
+            page_map.update(pages)
+            range_map.update(ranges)
+        self.page_map = page_map
+        self.range_map = range_map
+        self.tick = tick
+
+    def begin_tick(self):
+        """Advances to the next recorded tick; stays on the last one at the end."""
+        if self.tick + 1 < len(self.ticks):
+            self.tick += 1
+            pages, ranges = self.ticks[self.tick]
+            self.page_map.update(pages)
+            self.range_map.update(ranges)
+
+    def _page(self, page):
+        blob_id = self.page_map.get(page)
+        if blob_id is None:
+            raise MemoryReadError(f"Page {hex(page)} was not captured")
+        return self._blob(blob_id)
+
+    def _blob(self, blob_id):
+        data = self.cache.get(blob_id)
+        if data is None:
+            offset, length = self.blobs[blob_id]
+            data = zlib.decompress(self.data[offset:offset + length])
+            if len(self.cache) >= self.cache_pages:
+                self.cache.clear()
+            self.cache[blob_id] = data
+        return data
+
+    def read_bytes(self, address, size):
+        first = address & ~(PAGE_SIZE - 1)
+        offset = address - first
+        try:
+            if offset + size <= PAGE_SIZE:
+                return self._page(first)[offset:offset + size]
+            chunks = []
+            page = first
+            while page < address + size:
+                chunks.append(self._page(page))
+                page += PAGE_SIZE
+        except MemoryReadError:
+            recorded = self.range_map.get(address)
+            if recorded is None or recorded[0] < size:
+                raise
+            return self._blob(recorded[1])[:size]
+        return b''.join(chunks)[offset:offset + size]
+
+    def write_bytes(self, address, data):
+        raise MemoryWriteError("Capture replays are read-only")
+
+    def close(self):
+        self.data.close()
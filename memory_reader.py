@@ -1,17 +1,541 @@
-import pymem
+import bisect
+import mmap
+import os
+import sys
 import struct
+import time
 import ctypes
 import logging
 
+try:
+    import pymem
+except ImportError:  # pymem is Windows-only; memory images work without it
+    pymem = None
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_IMAGE_BASE = 0x400000
+PAGE_SIZE = 0x1000
+
+# Largest run of unrequested bytes read_many will pull in to merge two ranges
+READ_MANY_MAX_GAP = 256
+# Most iovecs process_vm_readv accepts per call
+IOV_MAX = 1024
+# Minimum seconds between two logged read failures; the rest are only counted
+ERROR_LOG_INTERVAL = 5.0
+# read_string reads long strings this many bytes at a time
+STRING_CHUNK = 64
+# Per-read debug messages are logged once per this many reads
+LOG_SAMPLE_EVERY = 100
+
+_struct_cache = {}
+
+
+def compiled_struct(fmt):
+    """Returns a cached struct.Struct for fmt."""
+    compiled = _struct_cache.get(fmt)
+    if compiled is None:
+        compiled = _struct_cache[fmt] = struct.Struct(fmt)
+    return compiled
+
+
+# Precompiled formats for the typed readers and writers
+_UINT8 = compiled_struct('B')
+_INT32 = compiled_struct('i')
+_UINT32 = compiled_struct('I')
+_INT64 = compiled_struct('q')
+_UINT64 = compiled_struct('Q')
+_FLOAT = compiled_struct('f')
+
+
+class LogSampler:
+    """Logs one in every `every` messages passed to it, for per-read messages.
+
+    The level check comes first, so while the level is disabled a call costs
+    one comparison and nothing is formatted.
+    """
+
+    def __init__(self, logger, every=LOG_SAMPLE_EVERY):
+        self.logger = logger
+        self.every = every
+        self.count = 0
+
+    def log(self, level, msg, *args):
+        if not self.logger.isEnabledFor(level):
+            return
+        self.count += 1
+        if (self.count - 1) % self.every == 0:
+            self.logger.log(level, msg + " [1 in %d sampled]", *args, self.every)
+
+
+_string_log = LogSampler(logger)
+
+
+class MemoryReadError(Exception):
+    """Raised by a memory backend when a range cannot be read."""
+
+
+class MemoryWriteError(Exception):
+    """Raised by a memory backend when a range cannot be written."""
+
+
+class MemoryBackend:
+    """Source of raw process memory used by WoWMemoryReader.
+
+    Backends expose the module base address, the process id and the two raw
+    primitives every typed reader is built on. Failures raise
+    MemoryReadError / MemoryWriteError. vectored is true when read_vectors
+    services all of its ranges in one call rather than one call per range.
+    """
+    base_address = 0
+    process_id = 0
+    vectored = False
+
+    def read_bytes(self, address, size):
+        raise NotImplementedError
+
+    def read_into(self, address, buffer):
+        """Fills a writable buffer (bytearray, memoryview, ctypes instance) from address.
+
+        Backends that can copy straight into the caller's buffer override this.
+        """
+        view = memoryview(buffer).cast('B')
+        view[:] = self.read_bytes(address, view.nbytes)
+
+    def read_vectors(self, ranges):
+        """Fills each (address, buffer) pair; returns one success flag per pair.
+
+        Backends that can service many remote ranges in one call override this.
+        """
+        results = []
+        for address, buffer in ranges:
+            try:
+                self.read_into(address, buffer)
+                results.append(True)
+            except MemoryReadError:
+                results.append(False)
+        return results
+
+    def write_bytes(self, address, data):
+        raise NotImplementedError
+
+
+class PymemBackend(MemoryBackend):
+    """Reads and writes a live process through pymem."""
 
-class WoWMemoryReader:
     def __init__(self, process_name="Ascension.exe"):
+        if pymem is None:
+            raise RuntimeError("pymem is not installed; use a MemoryImageBackend instead")
         self.pm = pymem.Pymem(process_name)
         self.base_address = pymem.process.module_from_name(self.pm.process_handle, process_name).lpBaseOfDll
         self.process_id = self.pm.process_id
-        logging.info(f"Module Base Address for {process_name}: {hex(self.base_address)}")
+
+    def read_bytes(self, address, size):
+        try:
+            return self.pm.read_bytes(address, size)
+        except pymem.exception.MemoryReadError as e:
+            raise MemoryReadError(str(e)) from e
+
+    def write_bytes(self, address, data):
+        try:
+            self.pm.write_bytes(address, data, len(data))
+        except pymem.exception.MemoryWriteError as e:
+            raise MemoryWriteError(str(e)) from e
+
+
+class MemoryImageBackend(MemoryBackend):
+    """Serves reads from in-process buffers laid out at virtual addresses.
+
+    Each region is a bytes, bytearray or mmap object mapped at a start
+    address. Regions must not overlap; a read has to fall entirely inside
+    one region. Used to profile and test the scanners against captured or
+    synthetic memory images without a running client.
+    """
+
+    def __init__(self, regions=None, base_address=DEFAULT_IMAGE_BASE, process_id=0):
+        self.base_address = base_address
+        self.process_id = process_id
+        self._starts = []
+        self._regions = []
+        self._views = []
+        for start, buffer in (regions or {}).items():
+            self.add_region(start, buffer)
+
+    @classmethod
+    def from_file(cls, path, start, base_address=DEFAULT_IMAGE_BASE):
+        """Maps a raw dump file read-only at the given start address."""
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls({start: buffer}, base_address=base_address)
+
+    def add_region(self, start, buffer):
+        """Maps buffer at start and returns it."""
+        index = bisect.bisect_right(self._starts, start)
+        if index and self._starts[index - 1] + len(self._regions[index - 1]) > start:
+            raise ValueError(f"Region at {hex(start)} overlaps an existing region")
+        if index < len(self._starts) and start + len(buffer) > self._starts[index]:
+            raise ValueError(f"Region at {hex(start)} overlaps an existing region")
+        self._starts.insert(index, start)
+        self._regions.insert(index, buffer)
+        self._views.insert(index, memoryview(buffer).cast('B'))
+        return buffer
+
+    def regions(self):
+        """Returns (start, buffer) pairs in address order."""
+        return list(zip(self._starts, self._regions))
+
+    def _locate(self, address, size):
+        index = bisect.bisect_right(self._starts, address) - 1
+        if index >= 0:
+            offset = address - self._starts[index]
+            view = self._views[index]
+            if offset + size <= len(view):
+                return view, offset
+        raise MemoryReadError(f"Unmapped range {hex(address)}+{size}")
+
+    def read_bytes(self, address, size):
+        view, offset = self._locate(address, size)
+        return view[offset:offset + size].tobytes()
+
+    def read_into(self, address, buffer):
+        target = memoryview(buffer).cast('B')
+        view, offset = self._locate(address, target.nbytes)
+        target[:] = view[offset:offset + target.nbytes]
+
+    def write_bytes(self, address, data):
+        try:
+            buffer, offset = self._locate(address, len(data))
+            buffer[offset:offset + len(data)] = data
+        except (MemoryReadError, TypeError) as e:
+            raise MemoryWriteError(f"Cannot write {len(data)} bytes at {hex(address)}: {e}") from e
+
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [('iov_base', ctypes.c_void_p), ('iov_len', ctypes.c_size_t)]
+
+
+def _buffer_address(buffer):
+    """Returns (address, size, keepalive) of a writable buffer for passing to C."""
+    view = memoryview(buffer).cast('B')
+    array = (ctypes.c_char * view.nbytes).from_buffer(view)
+    return ctypes.addressof(array), view.nbytes, array
+
+
+class NativeBackend(MemoryBackend):
+    """Reads and writes another process with direct OS calls, bypassing pymem.
+
+    Uses ReadProcessMemory/WriteProcessMemory on Windows and
+    process_vm_readv/process_vm_writev on Linux (e.g. a Wine-hosted client),
+    where read_vectors services up to IOV_MAX remote ranges per syscall.
+    """
+
+    PROCESS_VM_READ = 0x0010
+    PROCESS_VM_WRITE = 0x0020
+    PROCESS_VM_OPERATION = 0x0008
+    PROCESS_QUERY_INFORMATION = 0x0400
+
+    def __init__(self, process_id, base_address=DEFAULT_IMAGE_BASE, process_handle=None):
+        self.process_id = process_id
+        self.base_address = base_address
+        self.pm = None
+        if sys.platform == 'win32':
+            kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+            self._rpm = kernel32.ReadProcessMemory
+            self._rpm.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p,
+                                  ctypes.c_size_t, ctypes.POINTER(ctypes.c_size_t)]
+            self._rpm.restype = ctypes.c_int
+            self._wpm = kernel32.WriteProcessMemory
+            self._wpm.argtypes = self._rpm.argtypes
+            self._wpm.restype = ctypes.c_int
+            if process_handle is None:
+                access = (self.PROCESS_VM_READ | self.PROCESS_VM_WRITE |
+                          self.PROCESS_VM_OPERATION | self.PROCESS_QUERY_INFORMATION)
+                process_handle = kernel32.OpenProcess(access, False, process_id)
+                if not process_handle:
+                    raise OSError(ctypes.get_last_error(), f"OpenProcess failed for PID {process_id}")
+            self.process_handle = process_handle
+            self._transferred = ctypes.c_size_t()
+        else:
+            libc = ctypes.CDLL(None, use_errno=True)
+            self._readv = libc.process_vm_readv
+            self._writev = libc.process_vm_writev
+            for function in (self._readv, self._writev):
+                function.argtypes = [ctypes.c_int, ctypes.POINTER(_IOVec), ctypes.c_ulong,
+                                     ctypes.POINTER(_IOVec), ctypes.c_ulong, ctypes.c_ulong]
+                function.restype = ctypes.c_ssize_t
+            self.process_handle = None
+        # ReadProcessMemory has no vectored form; read_vectors loops on Windows
+        self.vectored = self.process_handle is None
+
+    @classmethod
+    def from_pymem(cls, backend):
+        """Reuses the process and module base pymem already resolved."""
+        native = cls(backend.process_id, backend.base_address, process_handle=backend.pm.process_handle)
+        native.pm = backend.pm
+        return native
+
+    @classmethod
+    def find(cls, process_name="Ascension.exe", base_address=DEFAULT_IMAGE_BASE):
+        """Opens the first Linux process whose name or command line matches process_name."""
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry}/comm') as f:
+                    comm = f.read().strip()
+                with open(f'/proc/{entry}/cmdline', 'rb') as f:
+                    cmdline = f.read().replace(b'\0', b' ').decode(errors='replace')
+            except OSError:
+                continue
+            if comm == process_name[:15] or process_name in cmdline:
+                return cls(int(entry), base_address)
+        raise RuntimeError(f"Process {process_name} not found")
+
+    def read_bytes(self, address, size):
+        buffer = bytearray(size)
+        self.read_into(address, buffer)
+        return bytes(buffer)
+
+    def read_into(self, address, buffer):
+        local, size, keepalive = _buffer_address(buffer)
+        if self.process_handle is not None:
+            if not self._rpm(self.process_handle, address, local, size, ctypes.byref(self._transferred)) \
+                    or self._transferred.value != size:
+                raise MemoryReadError(f"ReadProcessMemory failed at {hex(address)} (error {ctypes.get_last_error()})")
+            return
+        local_iov = _IOVec(local, size)
+        remote_iov = _IOVec(address, size)
+        if self._readv(self.process_id, ctypes.byref(local_iov), 1, ctypes.byref(remote_iov), 1, 0) != size:
+            raise MemoryReadError(f"process_vm_readv failed at {hex(address)} (errno {ctypes.get_errno()})")
+
+    def read_vectors(self, ranges):
+        if self.process_handle is not None:
+            return super().read_vectors(ranges)
+        results = [False] * len(ranges)
+        index = 0
+        while index < len(ranges):
+            batch = ranges[index:index + IOV_MAX]
+            local = (_IOVec * len(batch))()
+            remote = (_IOVec * len(batch))()
+            keepalive = []
+            for slot, (address, buffer) in enumerate(batch):
+                buffer_address, size, keep = _buffer_address(buffer)
+                keepalive.append(keep)
+                local[slot].iov_base, local[slot].iov_len = buffer_address, size
+                remote[slot].iov_base, remote[slot].iov_len = address, size
+            transferred = self._readv(self.process_id, local, len(batch), remote, len(batch), 0)
+            # The kernel stops at the first remote range it cannot read; mark the
+            # ranges completed before it and resume just after it
+            completed = 0
+            remaining = max(transferred, 0)
+            for slot in range(len(batch)):
+                if remaining < remote[slot].iov_len:
+                    break
+                remaining -= remote[slot].iov_len
+                results[index + slot] = True
+                completed += 1
+            index += completed if completed == len(batch) else completed + 1
+        return results
+
+    def write_bytes(self, address, data):
+        buffer = bytearray(data)
+        local, size, keepalive = _buffer_address(buffer)
+        if self.process_handle is not None:
+            if not self._wpm(self.process_handle, address, local, size, ctypes.byref(self._transferred)):
+                raise MemoryWriteError(f"WriteProcessMemory failed at {hex(address)} (error {ctypes.get_last_error()})")
+            return
+        local_iov = _IOVec(local, size)
+        remote_iov = _IOVec(address, size)
+        if self._writev(self.process_id, ctypes.byref(local_iov), 1, ctypes.byref(remote_iov), 1, 0) != size:
+            raise MemoryWriteError(f"process_vm_writev failed at {hex(address)} (errno {ctypes.get_errno()})")
+
+
+def open_backend(process_name="Ascension.exe"):
+    """Opens the live client with the fastest available backend.
+
+    On Windows pymem locates the process and module base and reads go through
+    NativeBackend, with plain pymem kept as the fallback. Without pymem (e.g. a
+    Wine-hosted client on Linux) the process is found through /proc.
+    """
+    if pymem is None:
+        return NativeBackend.find(process_name)
+    backend = PymemBackend(process_name)
+    try:
+        return NativeBackend.from_pymem(backend)
+    except (OSError, AttributeError) as e:
+        logger.warning("Native memory access unavailable, using pymem: %s", e)
+        return backend
+
+
+def _coalesce(items, max_gap):
+    """Merges (start, end, ...) items into (start, end, items) spans.
+
+    Items closer than max_gap bytes to the previous span join it, so one
+    read covers them all.
+    """
+    items.sort()
+    spans = []
+    span = []
+    span_start = span_end = 0
+    for item in items:
+        if span and item[0] > span_end + max_gap:
+            spans.append((span_start, span_end, span))
+            span = []
+        if not span:
+            span_start = item[0]
+            span_end = item[1]
+        elif item[1] > span_end:
+            span_end = item[1]
+        span.append(item)
+    if span:
+        spans.append((span_start, span_end, span))
+    return spans
+
+
+class WoWMemoryReader:
+    def __init__(self, process_name="Ascension.exe", backend=None, page_cache=False):
+        if backend is None:
+            backend = open_backend(process_name)
+        self.pm = getattr(backend, 'pm', None)
+        self.base_address = backend.base_address
+        self.process_id = backend.process_id
+        # Opt-in page cache: whole pages fetched on first touch, dropped every tick
+        self.page_cache = {} if page_cache else None
+        self.page_hits = 0
+        self.page_misses = 0
+        self.epoch = 0
+        # Failed reads: this tick, the previous tick, and since startup
+        self.tick_errors = 0
+        self.last_tick_errors = 0
+        self.total_errors = 0
+        self._suppressed_errors = 0
+        self._last_error_log = None
+        self.bind_backend(backend)
+        logger.info("Module Base Address for %s: %#x", process_name, self.base_address)
+
+    def bind_backend(self, backend):
+        """Routes every raw read through backend (and the page cache, if enabled)."""
+        self.backend = backend
+        if self.page_cache is not None:
+            self._read_bytes = self._read_cached
+            self._read_into = self._read_into_cached
+            self._read_vectors = self._read_vectors_cached
+        else:
+            self._read_bytes = backend.read_bytes
+            self._read_into = backend.read_into
+            self._read_vectors = backend.read_vectors
+        self.bump_epoch()
+
+    def begin_tick(self):
+        """Marks the start of a refresh tick.
+
+        Invalidates the page cache, rolls the per-tick error counter over and
+        notifies backends that track ticks (recording, replay).
+        """
+        self.bump_epoch()
+        self.last_tick_errors = self.tick_errors
+        self.tick_errors = 0
+        begin_tick = getattr(self.backend, 'begin_tick', None)
+        if begin_tick is not None:
+            begin_tick()
+
+    def bump_epoch(self):
+        """Drops every cached page; the next read of each page fetches it again."""
+        self.epoch += 1
+        if self.page_cache:
+            self.page_cache.clear()
+
+    def page_cache_stats(self):
+        return {'hits': self.page_hits, 'misses': self.page_misses,
+                'pages': len(self.page_cache or ()), 'epoch': self.epoch}
+
+    def error_stats(self):
+        return {'tick': self.tick_errors, 'last_tick': self.last_tick_errors,
+                'total': self.total_errors, 'suppressed': self._suppressed_errors}
+
+    def _read_failed(self, address, error):
+        """Counts a failed read and logs it, at most once per ERROR_LOG_INTERVAL."""
+        self.tick_errors += 1
+        self.total_errors += 1
+        now = time.monotonic()
+        if self._last_error_log is not None and now - self._last_error_log < ERROR_LOG_INTERVAL:
+            self._suppressed_errors += 1
+            return
+        suppressed = f" ({self._suppressed_errors} similar failures suppressed)" if self._suppressed_errors else ""
+        logger.error("Failed to read memory at %#x: %s%s", address, error, suppressed)
+        self._suppressed_errors = 0
+        self._last_error_log = now
+
+    def _page(self, page):
+        data = self.page_cache.get(page)
+        if data is None:
+            self.page_misses += 1
+            data = self.page_cache[page] = self.backend.read_bytes(page, PAGE_SIZE)
+        else:
+            self.page_hits += 1
+        return data
+
+    def _read_cached(self, address, size):
+        first = address & ~(PAGE_SIZE - 1)
+        offset = address - first
+        try:
+            if offset + size <= PAGE_SIZE:
+                return self._page(first)[offset:offset + size]
+            chunks = []
+            page = first
+            while page < address + size:
+                chunks.append(self._page(page))
+                page += PAGE_SIZE
+        except MemoryReadError:
+            # Part of the page is unmapped; read just the requested range
+            return self.backend.read_bytes(address, size)
+        return b''.join(chunks)[offset:offset + size]
+
+    def _read_into_cached(self, address, buffer):
+        target = memoryview(buffer).cast('B')
+        size = target.nbytes
+        first = address & ~(PAGE_SIZE - 1)
+        offset = address - first
+        if offset + size <= PAGE_SIZE:
+            try:
+                target[:] = memoryview(self._page(first))[offset:offset + size]
+                return
+            except MemoryReadError:
+                pass
+        target[:] = self._read_cached(address, size)
+
+    def _read_vectors_cached(self, ranges):
+        results = []
+        for address, buffer in ranges:
+            try:
+                self._read_into_cached(address, buffer)
+                results.append(True)
+            except MemoryReadError:
+                results.append(False)
+        return results
+
+    def _invalidate_pages(self, address, size):
+        if self.page_cache:
+            page = address & ~(PAGE_SIZE - 1)
+            while page < address + size:
+                self.page_cache.pop(page, None)
+                page += PAGE_SIZE
+
+    def start_recording(self, path):
+        """Records every page read from now on into a capture file (see memory_capture)."""
+        from memory_capture import RecordingBackend
+        self.stop_recording()
+        self.bind_backend(RecordingBackend(self.backend, path))
+        logger.info("Recording memory reads to %s", path)
+
+    def stop_recording(self):
+        """Finishes the capture file started by start_recording, if any."""
+        from memory_capture import RecordingBackend
+        if isinstance(self.backend, RecordingBackend):
+            self.backend.close()
+            self.bind_backend(self.backend.backend)
 
     def register_function(self, function_address, return_type=None, args=None):
         """Register a function for calling from memory"""
@@ -24,131 +548,285 @@ class WoWMemoryReader:
         return function_prototype(function_address)
 
     def read_memory(self, address, data_type):
+        """Reads a ctypes type; simple types (c_int, c_float, ...) come back as their value."""
         try:
-            return self.pm.read_memory(address, data_type)
-        except Exception as e:
-            logging.error(f"Error reading memory at {hex(address)}: {e}")
+            instance = data_type.from_buffer_copy(self._read_bytes(address, ctypes.sizeof(data_type)))
+        except MemoryReadError as e:
+            self._read_failed(address, e)
             return None
+        return instance.value if isinstance(instance, ctypes._SimpleCData) else instance
 
     def write_memory(self, address, data_type, value):
-        try:
-            self.pm.write_memory(address, data_type, value)
-            return True
-        except Exception as e:
-            logging.error(f"Error writing memory at {hex(address)}: {e}")
-            return False
+        """Writes value (or a data_type instance) as data_type."""
+        instance = value if isinstance(value, data_type) else data_type(value)
+        return self.write(address, bytes(instance))
         
     def read(self, address, size):
         """Reads raw bytes from memory at the specified address."""
         try:
-            return self.pm.read_bytes(address, size)
-        except pymem.exception.MemoryReadError as e:
-            logging.error(f"Failed to read memory at {hex(address)}: {e}")
+            return self._read_bytes(address, size)
+        except MemoryReadError as e:
+            self._read_failed(address, e)
+            return None
+
+    def read_into(self, address, buffer):
+        """Fills a caller-owned buffer (bytearray, memoryview, ctypes instance) in place.
+
+        Returns True on success. Reusing the same buffer every tick keeps
+        refresh loops from allocating a bytes object per read.
+        """
+        try:
+            self._read_into(address, buffer)
+            return True
+        except MemoryReadError as e:
+            self._read_failed(address, e)
+            return False
+
+    # Fast paths for hot loops: failures are only counted in tick_errors, never
+    # logged, so a walk over freshly freed nodes costs no formatting or I/O.
+
+    def try_read(self, address, size):
+        """Like read(), but never logs; returns None on failure."""
+        try:
+            return self._read_bytes(address, size)
+        except MemoryReadError:
+            self.tick_errors += 1
+            self.total_errors += 1
             return None
 
+    def try_read_into(self, address, buffer):
+        """Like read_into(), but never logs; returns False on failure."""
+        try:
+            self._read_into(address, buffer)
+            return True
+        except MemoryReadError:
+            self.tick_errors += 1
+            self.total_errors += 1
+            return False
+
+    def try_read_value(self, address, fmt, default=None):
+        """Reads one struct-formatted value (e.g. 'I', '<f'), or default on failure. Never logs."""
+        compiled = compiled_struct(fmt)
+        try:
+            return compiled.unpack(self._read_bytes(address, compiled.size))[0]
+        except (MemoryReadError, struct.error):
+            self.tick_errors += 1
+            self.total_errors += 1
+            return default
+
+    def try_read_vectors(self, ranges):
+        """Fills every (address, buffer) pair in as few backend calls as possible. Never logs.
+
+        Returns one success flag per pair.
+        """
+        succeeded = self._read_vectors(ranges)
+        failed = len(succeeded) - sum(succeeded)
+        self.tick_errors += failed
+        self.total_errors += failed
+        return succeeded
+
+    def read_many(self, requests, max_gap=READ_MANY_MAX_GAP):
+        """Reads many (address, fmt) pairs using as few block reads as possible.
+
+        Requests are sorted and adjacent or overlapping ranges (separated by
+        at most max_gap bytes) are merged into one read. Values come back in
+        request order; single-value formats are unwrapped and anything that
+        could not be read is None.
+        """
+        items = []
+        for index, (address, fmt) in enumerate(requests):
+            if address:
+                compiled = compiled_struct(fmt)
+                items.append((address, address + compiled.size, index, compiled))
+        spans = _coalesce(items, max_gap)
+
+        # Every block goes out in one vectored call where the backend supports it
+        blocks = [bytearray(end - start) for start, end, _ in spans]
+        succeeded = self._read_vectors([(start, block) for (start, _, _), block in zip(spans, blocks)])
+
+        results = [None] * len(requests)
+        for (start, end, span), block, ok in zip(spans, blocks, succeeded):
+            if ok:
+                self._decode_span(span, start, block, results)
+            elif len(span) == 1:
+                self._read_failed(start, "unreadable range")
+            else:
+                # The merged range crosses unreadable memory; fall back per item
+                for item in span:
+                    block = self.read(item[0], item[1] - item[0])
+                    if block is not None:
+                        self._decode_span([item], item[0], block, results)
+        return results
+
+    def try_read_blocks(self, requests, max_gap=READ_MANY_MAX_GAP):
+        """Reads many (address, size) ranges using as few backend calls as possible. Never logs.
+
+        Ranges are coalesced like read_many and the merged blocks go out in
+        one vectored call. Returns one (block, offset) pair per request, so
+        the caller decodes the range at block[offset:offset + size] without
+        a copy, or None where the range could not be read.
+        """
+        items = sorted((address, address + size, index)
+                       for index, (address, size) in enumerate(requests) if address)
+        spans = _coalesce(items, max_gap)
+        blocks = [bytearray(end - start) for start, end, _ in spans]
+        succeeded = self._read_vectors([(start, block) for (start, _, _), block in zip(spans, blocks)])
+
+        results = [None] * len(requests)
+        retry = []
+        for (start, _, span), block, ok in zip(spans, blocks, succeeded):
+            if ok:
+                for address, _, index in span:
+                    results[index] = (block, address - start)
+            else:
+                retry.extend(span)
+        if retry:
+            # A merged range crossed unreadable memory; retry its items one range each
+            blocks = [bytearray(end - address) for address, end, _ in retry]
+            succeeded = self.try_read_vectors([(item[0], block) for item, block in zip(retry, blocks)])
+            for (_, _, index), block, ok in zip(retry, blocks, succeeded):
+                if ok:
+                    results[index] = (block, 0)
+        return results
+
+    def _decode_span(self, span, start, block, results):
+        """Decodes every item of a merged span from its block."""
+        for address, _, index, compiled in span:
+            values = compiled.unpack_from(block, address - start)
+            results[index] = values[0] if len(values) == 1 else values
+
     def write(self, address, buffer):
         """Writes raw bytes to memory at the specified address."""
         if not address or not buffer:
-            logging.error("Invalid address or buffer.")
+            logger.error("Invalid address or buffer.")
             return False
 
         try:
-            self.pm.write_bytes(address, buffer, len(buffer))
+            self.backend.write_bytes(address, buffer)
+            self._invalidate_pages(address, len(buffer))
             return True
-        except pymem.exception.MemoryWriteError as e:
-            logging.error(f"Failed to write memory at {hex(address)}: {e}")
+        except MemoryWriteError as e:
+            logger.error("Failed to write memory at %#x: %s", address, e)
             return False
         except Exception as e:
-            logging.error(f"Unexpected error while writing memory at {hex(address)}: {e}")
+            logger.error("Unexpected error while writing memory at %#x: %s", address, e)
             return False
 
     def write_uint(self, address, value):
         """Writes a 32-bit unsigned integer to memory."""
         if not address or value is None:
-            logging.error("Invalid address or value for write_uint.")
+            logger.error("Invalid address or value for write_uint.")
             return False
         
         if not (0 <= value <= 0xFFFFFFFF):
-            logging.error(f"Value {value} is out of range for a 32-bit unsigned integer.")
+            logger.error("Value %s is out of range for a 32-bit unsigned integer.", value)
             return False
 
         try:
-            buffer = struct.pack('I', value)
+            buffer = _UINT32.pack(value)
             self.write(address, buffer)
-            logging.info(f"Wrote uint value {value} to address {hex(address)}")
+            logger.debug("Wrote uint value %s to address %#x", value, address)
             return True
         except Exception as e:
-            logging.error(f"Failed to write uint at {hex(address)}: {e}")
+            logger.error("Failed to write uint at %#x: %s", address, e)
             return False
 
     def write_uint64(self, address, value):
         """Writes a 64-bit unsigned integer to memory."""
         if not address or value is None:
-            logging.error("Invalid address or value for write_uint64.")
+            logger.error("Invalid address or value for write_uint64.")
             return False
 
         if not (0 <= value <= 0xFFFFFFFFFFFFFFFF):
-            logging.error(f"Value {value} is out of range for a 64-bit unsigned integer.")
+            logger.error("Value %s is out of range for a 64-bit unsigned integer.", value)
             return False
 
         try:
-            buffer = struct.pack('Q', value)
+            buffer = _UINT64.pack(value)
             self.write(address, buffer)
-            logging.info(f"Wrote uint64 value {value} to address {hex(address)}")
+            logger.debug("Wrote uint64 value %s to address %#x", value, address)
             return True
         except Exception as e:
-            logging.error(f"Failed to write uint64 at {hex(address)}: {e}")
+            logger.error("Failed to write uint64 at %#x: %s", address, e)
             return False
 
-    def read_string(self, address, max_length=12):
-        """Reads a string from memory, stopping at a null terminator or max_length."""
-        raw_data = self.pm.read_bytes(address, max_length + 1)
-        logging.info(f"Raw data read from address {hex(address)}: {raw_data}")
-        
-        name = ""
-        for byte in raw_data:
-            if byte == 0:  # Null terminator found
+    def read_string(self, address, max_length=12, encoding='utf-8'):
+        """Reads a null-terminated string of at most max_length bytes.
+
+        Long limits are read in STRING_CHUNK pieces, stopping at the chunk
+        holding the terminator. Returns None if nothing could be read.
+        """
+        chunks = []
+        offset = 0
+        while offset < max_length:
+            data = self.read(address + offset, min(STRING_CHUNK, max_length - offset))
+            if data is None:
+                if not chunks:
+                    return None
                 break
-            name += chr(byte)
-        
-        return name[:12]
+            _string_log.log(logging.DEBUG, "Raw data read from address %#x: %r", address + offset, data)
+            end = data.find(b'\0')
+            if end >= 0:
+                chunks.append(data[:end])
+                break
+            chunks.append(data)
+            offset += len(data)
+        return b''.join(chunks).decode(encoding, errors='replace')
+
+    def read_strings(self, addresses, max_length=40, encoding='utf-8'):
+        """Reads many null-terminated strings, in one vectored read where the backend supports it.
+
+        Returns a list in address order; entries that could not be read are None.
+        """
+        blocks = [bytearray(max_length) for _ in addresses]
+        succeeded = self._read_vectors(list(zip(addresses, blocks)))
+        strings = []
+        for address, block, ok in zip(addresses, blocks, succeeded):
+            if not ok:
+                self._read_failed(address, "unreadable string")
+                strings.append(None)
+                continue
+            end = block.find(b'\0')
+            strings.append(block[:end if end >= 0 else max_length].decode(encoding, errors='replace'))
+        return strings
 
     def read_byte(self, address):
         """Reads a single byte from memory."""
-        data = self.read(address, 1)
-        return struct.unpack('B', data)[0] if data else None
+        data = self.read(address, _UINT8.size)
+        return _UINT8.unpack(data)[0] if data else None
 
     def read_struct(self, address, struct_type):
         """Reads a structure from memory and returns it as an instance of struct_type."""
-        data = self.read(address, ctypes.sizeof(struct_type))
-        if data is None:
-            return None
-        return struct_type.from_buffer_copy(data)
+        return self.read_struct_into(address, struct_type())
+
+    def read_struct_into(self, address, instance):
+        """Reads a structure into an existing ctypes instance and returns it, or None on failure."""
+        return instance if self.read_into(address, instance) else None
 
     def read_uint64(self, address):
         """Reads a 64-bit unsigned integer from memory."""
-        data = self.read(address, ctypes.sizeof(ctypes.c_uint64))
-        return struct.unpack('Q', data)[0] if data else None
+        data = self.read(address, _UINT64.size)
+        return _UINT64.unpack(data)[0] if data else None
 
     def read_int64(self, address):
         """Reads a 64-bit signed integer from memory."""
-        data = self.read(address, ctypes.sizeof(ctypes.c_int64))
-        return struct.unpack('q', data)[0] if data else None
+        data = self.read(address, _INT64.size)
+        return _INT64.unpack(data)[0] if data else None
 
     def read_int32(self, address):
         """Reads a 32-bit signed integer from memory."""
-        data = self.read(address, ctypes.sizeof(ctypes.c_int32))
-        return struct.unpack('i', data)[0] if data else None
+        data = self.read(address, _INT32.size)
+        return _INT32.unpack(data)[0] if data else None
 
     def read_int(self, address):
         """Reads a 32-bit signed integer (common int) from memory."""
-        data = self.read(address, ctypes.sizeof(ctypes.c_int))
-        return struct.unpack('i', data)[0] if data else None
+        data = self.read(address, _INT32.size)
+        return _INT32.unpack(data)[0] if data else None
 
     def read_float(self, address):
         """Reads a 32-bit floating-point number from memory."""
-        data = self.read(address, ctypes.sizeof(ctypes.c_float))
-        return struct.unpack('f', data)[0] if data else None
+        data = self.read(address, _FLOAT.size)
+        return _FLOAT.unpack(data)[0] if data else None
 
     def read_pointer32(self, address):
         """Reads a 32-bit pointer (address) from memory and returns it as a c_void_p."""
@@ -157,5 +835,5 @@ class WoWMemoryReader:
 
     def read_uint(self, address):
         """Reads a 32-bit unsigned integer from memory."""
-        data = self.read(address, ctypes.sizeof(ctypes.c_uint))
-        return struct.unpack('I', data)[0] if data else None
\ No newline at end of file
+        data = self.read(address, _UINT32.size)
+        return _UINT32.unpack(data)[0] if data else None
\ No newline at end of file
@@ -1,113 +1,261 @@
 from memory_reader import WoWMemoryReader
 from offsets import Offsets
-import keyboard
+from layouts import RecordLayout, OBJECT_LAYOUT, UNIT_LAYOUT, UNIT_FIELDS_LAYOUT
+from object_walker import ObjectListWalker
+from object_table import ObjectTable
+from world_snapshot import WorldSnapshot
+from spatial_index import SpatialGrid
+from pointer_chain import object_manager_chain
+
+try:
+    import keyboard
+except ImportError:  # hotkeys are optional when profiling against memory images
+    keyboard = None
+
+# Object header block: everything from the vtable up to and including Rot
+OBJECT_HEADER_SIZE = 0x7B0
+# Unit descriptor block: every EUnitFields slot before UNIT_FIELD_PADDING
+UNIT_FIELDS_SIZE = Offsets.EUnitFields["UNIT_FIELD_PADDING"] * 4
+
+# Byte ranges re-read for surviving objects on an incremental refresh
+_POSITION_OFFSETS = (Offsets.ObjectOffsets.Pos_X, Offsets.ObjectOffsets.Pos_Y,
+                     Offsets.ObjectOffsets.Pos_Z, Offsets.ObjectOffsets.Rot)
+VOLATILE_HEADER_RANGE = (min(_POSITION_OFFSETS), max(_POSITION_OFFSETS) + 4)
+_VITAL_OFFSETS = (Offsets.UnitOffsets.Health, Offsets.UnitOffsets.MaxHealth,
+                  Offsets.UnitOffsets.Mana, Offsets.UnitOffsets.MaxMana, Offsets.UnitOffsets.Level)
+VOLATILE_UNIT_RANGE = (min(_VITAL_OFFSETS), max(_VITAL_OFFSETS) + 4)
+
+# The volatile fields, laid out relative to the start of their range
+VOLATILE_HEADER_LAYOUT = RecordLayout("VolatileHeader", [
+    (name, offset - VOLATILE_HEADER_RANGE[0], 'f')
+    for name, offset in (("pos_x", Offsets.ObjectOffsets.Pos_X), ("pos_y", Offsets.ObjectOffsets.Pos_Y),
+                         ("pos_z", Offsets.ObjectOffsets.Pos_Z), ("rot", Offsets.ObjectOffsets.Rot))
+])
+VOLATILE_UNIT_LAYOUT = RecordLayout("VolatileUnit", [
+    (name, offset - VOLATILE_UNIT_RANGE[0], 'i')
+    for name, offset in (("health", Offsets.UnitOffsets.Health), ("maxhealth", Offsets.UnitOffsets.MaxHealth),
+                         ("mana", Offsets.UnitOffsets.Mana), ("maxmana", Offsets.UnitOffsets.MaxMana),
+                         ("level", Offsets.UnitOffsets.Level))
+])
+
+# Objects refreshed per vectored read; bounds the transient request/block lists
+VOLATILE_BATCH = 256
+
+TRACKED_TYPES = (Offsets.ObjectType.Player, Offsets.ObjectType.NPC)
+
+
+def _valid_position(value):
+    """Returns value if it is a plausible coordinate, else 0.0."""
+    return value if -10000.0 < value < 10000.0 else 0.0
+
+
+def refresh_volatile(pm, objects):
+    """Re-reads position, rotation, health, power and level of objects.
+
+    The ranges are coalesced (an object's header tail and its descriptor are
+    usually adjacent) and each batch of VOLATILE_BATCH objects goes out in
+    one vectored read, so the refresh costs one backend call per block
+    rather than two per object even where the backend loops per range.
+    Returns the objects whose position changed.
+    """
+    header_size = VOLATILE_HEADER_LAYOUT.size
+    unit_size = VOLATILE_UNIT_LAYOUT.size
+    moved = []
+    for start in range(0, len(objects), VOLATILE_BATCH):
+        batch = objects[start:start + VOLATILE_BATCH]
+        requests = []
+        for obj in batch:
+            requests.append((obj.address + VOLATILE_HEADER_RANGE[0], header_size))
+            requests.append((obj.unit_fields_address + VOLATILE_UNIT_RANGE[0]
+                             if obj.unit_fields_address else 0, unit_size))
+        blocks = pm.try_read_blocks(requests)
+        for index, obj in enumerate(batch):
+            header = blocks[2 * index]
+            if header is not None and obj.apply_volatile_header(*header):
+                moved.append(obj)
+            unit = blocks[2 * index + 1]
+            if unit is not None:
+                obj.apply_volatile_unit(*unit)
+    return moved
+
 
 class GameObject:
-    def __init__(self, pm, address):
+    """Decoded snapshot of one object node.
+
+    The object header and the unit descriptor block are each fetched with a
+    single read into a scratch buffer and decoded in one call; only the
+    decoded fields are kept, so an object costs its slots rather than its
+    raw blocks. Pass header_block/unit_block to reuse buffers across the
+    objects of one refresh; they must not be shared between threads.
+    Fields are None when their block could not be read.
+    """
+    __slots__ = ('pm', 'address', 'unit_fields_address', 'guid', 'type',
+                 'x_pos', 'y_pos', 'z_pos', 'rotation',
+                 'health', 'max_health', 'energy', 'max_energy', 'level')
+
+    def __init__(self, pm, address, header_block=None, unit_block=None):
         self.pm = pm
         self.address = address
-        self.guid = self.read_guid()
-        self.type = self.read_type()
-        self.unit_fields_address = None
-        self.x_pos = None
-        self.y_pos = None
-        self.z_pos = None
-        self.rotation = None
-        self.health = None
-        self.max_health = None
-        self.energy = None
-        self.max_energy = None
-        self.level = None
-        self.load_positions()
-        self.load_unit_data()
-
-    def read_guid(self):
-        try:
-            return self.pm.read_uint64(self.address + Offsets.ObjectOffsets.Guid)
-        except Exception as e:
-            return None
+        self.load_header(header_block)
+        self.load_unit_data(unit_block)
 
-    def read_type(self):
-        try:
-            return self.pm.read_int(self.address + Offsets.ObjectOffsets.Type)
-        except Exception as e:
-            return None
+    def load_header(self, block=None):
+        """Reads and decodes the object header block (guid, type, position, unit fields pointer)."""
+        if block is None:
+            block = bytearray(OBJECT_HEADER_SIZE)
+        if self.pm.try_read_into(self.address, block):
+            record = OBJECT_LAYOUT.decode(block)
+            self.unit_fields_address = record.unitfields
+            self.guid = record.guid
+            self.type = record.type
+            self.x_pos = _valid_position(record.pos_x)
+            self.y_pos = _valid_position(record.pos_y)
+            self.z_pos = _valid_position(record.pos_z)
+            self.rotation = _valid_position(record.rot)
+        else:
+            self.unit_fields_address = self.guid = self.type = None
+            self.x_pos = self.y_pos = self.z_pos = self.rotation = None
 
-    def read_position(self, offset):
-        """Reads a position value using the provided offset."""
-        try:
-            value = self.pm.read_float(self.address + offset)
-            if self.is_valid_position_value(value):
-                return value
-            else:
-                return 0.0
-        except Exception as e:
-            return 0.0
+    def load_unit_data(self, block=None):
+        """Reads and decodes the unit descriptor block (health, power, level, ...)."""
+        if block is None:
+            block = bytearray(UNIT_FIELDS_SIZE)
+        if self.unit_fields_address and self.pm.try_read_into(self.unit_fields_address, block):
+            record = UNIT_LAYOUT.decode(block)
+            self.health = record.health
+            self.max_health = record.maxhealth
+            self.energy = record.mana
+            self.max_energy = record.maxmana
+            self.level = record.level
+        else:
+            self.health = self.max_health = self.energy = self.max_energy = self.level = None
 
-    def is_valid_position_value(self, value):
-        """Validates whether the position value is within a reasonable range."""
-        return -10000.0 < value < 10000.0
+    def refresh_volatile(self):
+        """Re-reads only position, rotation, health, power and level."""
+        refresh_volatile(self.pm, [self])
 
-    def load_positions(self):
-        """Attempts to load x, y, z positions and rotation."""
-        self.x_pos = self.read_position(Offsets.ObjectOffsets.Pos_X)
-        self.y_pos = self.read_position(Offsets.ObjectOffsets.Pos_Y)
-        self.z_pos = self.read_position(Offsets.ObjectOffsets.Pos_Z)
-        self.rotation = self.read_position(Offsets.ObjectOffsets.Rot)
+    def apply_volatile_header(self, block, offset=0):
+        """Decodes position and rotation; returns True if the position changed."""
+        record = VOLATILE_HEADER_LAYOUT.decode(block, offset)
+        x, y, z = _valid_position(record.pos_x), _valid_position(record.pos_y), _valid_position(record.pos_z)
+        moved = x != self.x_pos or y != self.y_pos or z != self.z_pos
+        self.x_pos, self.y_pos, self.z_pos = x, y, z
+        self.rotation = _valid_position(record.rot)
+        return moved
 
-    def load_unit_data(self):
-        """Loads health, energy, max health, max energy, and level."""
-        try:
-            self.unit_fields_address = self.pm.read_uint(self.address + Offsets.ObjectOffsets.UnitFields)
-            if self.unit_fields_address:
-                self.health = self.pm.read_int(self.unit_fields_address + Offsets.UnitOffsets.Health)
-                self.max_health = self.pm.read_int(self.unit_fields_address + Offsets.UnitOffsets.MaxHealth)
-                self.energy = self.pm.read_int(self.unit_fields_address + Offsets.UnitOffsets.Mana)
-                self.max_energy = self.pm.read_int(self.unit_fields_address + Offsets.UnitOffsets.MaxMana)
-                self.level = self.pm.read_int(self.unit_fields_address + Offsets.UnitOffsets.Level)
-        except Exception as e:
-            pass
+    def apply_volatile_unit(self, block, offset=0):
+        record = VOLATILE_UNIT_LAYOUT.decode(block, offset)
+        self.health = record.health
+        self.max_health = record.maxhealth
+        self.energy = record.mana
+        self.max_energy = record.maxmana
+        self.level = record.level
+
+    def descriptor(self):
+        """Reads and decodes the full unit descriptor block (see layouts.UNIT_FIELDS_LAYOUT)."""
+        if not self.unit_fields_address:
+            return None
+        block = bytearray(UNIT_FIELDS_SIZE)
+        if not self.pm.try_read_into(self.unit_fields_address, block):
+            return None
+        return UNIT_FIELDS_LAYOUT.decode(block)
 
 class ObjectManager:
-    def __init__(self, memory_reader):
+    def __init__(self, memory_reader, incremental=False):
         self.pm = memory_reader
         self.objects = {}
+        self.table = ObjectTable()
+        self.spatial = SpatialGrid()
         self.first_object = None
         self.local_guid = None
+        self.incremental = incremental
+        self.walker = ObjectListWalker(memory_reader, max_age=0.0)
+        self.roots = object_manager_chain(memory_reader)
+        self.roots_generation = None
+        self.nodes = {}
+        self.last_refresh = {'added': 0, 'removed': 0, 'refreshed': 0}
         self.load_addresses()
 
         # Set up keybind for activating the object manager
-        keyboard.add_hotkey('0', self.enum_visible_objects)
+        if keyboard is not None:
+            keyboard.add_hotkey('0', self.enum_visible_objects)
 
     def load_addresses(self):
-        """Load essential addresses for object manager."""
+        """Load essential addresses for object manager.
+
+        The pointer chain is cached, so this is cheap enough to call every tick;
+        it only re-resolves after a loading screen or reconnect.
+        """
         try:
-            client_connection = self.pm.read_uint(self.pm.base_address + Offsets.ObjectManager.StaticClientConnection - 0x400000)
-            object_manager = self.pm.read_uint(client_connection + Offsets.ObjectManager.ObjectManagerOffset)
-            self.first_object = self.pm.read_uint(object_manager + Offsets.ObjectManager.FirstObjectOffset)
-            self.local_guid = self.pm.read_uint64(object_manager + Offsets.ObjectManager.LocalGuidOffset)
+            object_manager = self.roots.resolve()
+            if object_manager:
+                self.first_object, self.local_guid = self.pm.read_many([
+                    (object_manager + Offsets.ObjectManager.FirstObjectOffset, 'I'),
+                    (object_manager + Offsets.ObjectManager.LocalGuidOffset, 'Q'),
+                ])
+            else:
+                self.first_object = None
         except Exception as e:
             pass
+        self.walker.first_object = self.first_object
 
-    def enum_visible_objects(self):
+    def enum_visible_objects(self, incremental=None):
+        """Refreshes self.objects from the object list.
+
+        A full refresh rebuilds every GameObject. An incremental refresh keeps
+        the objects whose node address and guid are unchanged since the last
+        walk and only re-reads their volatile fields, so its cost scales with
+        churn rather than population.
+        """
+        if incremental is None:
+            incremental = self.incremental
         try:
+            # Pages cached before this refresh would hand back last refresh's positions
+            self.pm.bump_epoch()
+            self.load_addresses()
+            if self.roots.generation != self.roots_generation:
+                # Node addresses from before a loading screen are meaningless now
+                self.roots_generation = self.roots.generation
+                incremental = False
             if not self.first_object:
                 return
 
-            current_object = self.first_object
-            self.objects.clear()
+            # Scratch blocks for this refresh only, so a hotkey refresh cannot share them
+            header_block = bytearray(OBJECT_HEADER_SIZE)
+            unit_block = bytearray(UNIT_FIELDS_SIZE)
+            previous = self.nodes if incremental else {}
+            nodes = {}
+            objects = {}
+            survivors = []
+            created = []
+            for address, guid, obj_type in self.walker.walk(force=True):
+                if obj_type not in TRACKED_TYPES:
+                    continue
+                nodes[address] = guid
+                obj = self.objects.get(guid) if previous.get(address) == guid else None
+                # GameObject reads never raise; a node freed mid-walk just decodes to None
+                if obj is not None and obj.address == address:
+                    survivors.append(obj)
+                else:
+                    obj = GameObject(self.pm, address, header_block, unit_block)
+                    if obj.guid is None:
+                        continue
+                    created.append(obj)
+                objects[obj.guid] = obj
 
-            while current_object and current_object % 2 == 0:
-                try:
-                    obj = GameObject(self.pm, current_object)
-                    if obj.guid is not None and obj.type in [Offsets.ObjectType.Player, Offsets.ObjectType.NPC]:  # Filtering object types
-                        self.objects[obj.guid] = obj
-                except Exception as e:
-                    pass
+            # Every survivor's volatile fields come back in one vectored read;
+            # only new and moved objects need their grid cell updated
+            moved = refresh_volatile(self.pm, survivors) if survivors else []
 
-                current_object = self.pm.read_uint(current_object + Offsets.ObjectManager.NextObjectOffset)
-                if current_object is None:
-                    break
+            added = len(created)
+            refreshed = len(survivors)
+            removed = len(self.objects) - refreshed
+            self.spatial.retain(objects)
+            self.spatial.update_from(created)
+            self.spatial.update_from(moved)
+            self.objects = objects
+            self.nodes = nodes
+            self.last_refresh = {'added': added, 'removed': removed, 'refreshed': refreshed}
 
         except Exception as e:
             pass
@@ -120,6 +268,30 @@ class ObjectManager:
         """Retrieves all objects of a specific type (e.g., Player, NPC)."""
         return [obj for obj in self.objects.values() if obj.type == obj_type]
 
+    def get_objects_within(self, x, y, z, radius):
+        """Retrieves objects within radius of (x, y, z), nearest first."""
+        return [self.objects[guid] for _, guid in self.spatial.within(x, y, z, radius)]
+
+    def get_nearest_objects(self, x, y, z, count=1, max_radius=None):
+        """Retrieves the count objects closest to (x, y, z), nearest first."""
+        return [self.objects[guid] for _, guid in self.spatial.nearest(x, y, z, count, max_radius)]
+
+    def get_objects_in_cone(self, x, y, z, facing, half_angle, radius):
+        """Retrieves objects within radius and half_angle radians of facing."""
+        return [self.objects[guid] for _, guid in self.spatial.cone(x, y, z, facing, half_angle, radius)]
+
+    def snapshot(self):
+        """Exports the tracked objects as a WorldSnapshot (requires numpy).
+
+        The columnar table is only filled here, so refreshes that nobody
+        snapshots do not pay for a second copy of every object.
+        """
+        objects = self.objects
+        self.table.retain(objects)
+        for obj in objects.values():
+            self.table.upsert(obj)
+        return WorldSnapshot.from_table(self.table)
+
     def __str__(self):
         return f"ObjectManager(Objects: {len(self.objects)})"
 
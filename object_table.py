@@ -0,0 +1,103 @@
+from array import array
+
+# Column name -> array typecode
+COLUMNS = {
+    'guid': 'Q',
+    'address': 'I',
+    'type': 'i',
+    'x_pos': 'f',
+    'y_pos': 'f',
+    'z_pos': 'f',
+    'rotation': 'f',
+    'health': 'i',
+    'max_health': 'i',
+    'energy': 'i',
+    'max_energy': 'i',
+    'level': 'i',
+}
+
+
+class ObjectTable:
+    """Columnar store of tracked objects: one typed array per field.
+
+    Rows are addressed by index and looked up by guid. Removed rows go on a
+    free list and are reused, so a table that has grown to the busiest
+    population costs a few dozen bytes per object with no per-object dict.
+    Missing values are stored as 0.
+    """
+
+    def __init__(self):
+        self.columns = {name: array(typecode) for name, typecode in COLUMNS.items()}
+        self.rows = {}
+        self.free_rows = []
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, guid):
+        return guid in self.rows
+
+    def upsert(self, obj):
+        """Stores every column of obj (a GameObject or anything with the same attributes). Returns its row."""
+        row = self.rows.get(obj.guid)
+        if row is None:
+            if self.free_rows:
+                row = self.free_rows.pop()
+            else:
+                row = len(self.columns['guid'])
+                for column in self.columns.values():
+                    column.append(0)
+            self.rows[obj.guid] = row
+        for name, column in self.columns.items():
+            value = getattr(obj, name)
+            column[row] = value if value is not None else 0
+        return row
+
+    def remove(self, guid):
+        """Frees the row of guid, if any."""
+        row = self.rows.pop(guid, None)
+        if row is not None:
+            self.columns['guid'][row] = 0
+            self.free_rows.append(row)
+
+    def retain(self, guids):
+        """Removes every row whose guid is not in guids."""
+        for guid in [guid for guid in self.rows if guid not in guids]:
+            self.remove(guid)
+
+    def clear(self):
+        for column in self.columns.values():
+            del column[:]
+        self.rows.clear()
+        self.free_rows.clear()
+
+    def row(self, guid):
+        """Returns an ObjectRow view of guid, or None."""
+        row = self.rows.get(guid)
+        return ObjectRow(self, row) if row is not None else None
+
+    def live_rows(self):
+        """Returns the indices of occupied rows."""
+        return list(self.rows.values())
+
+    def __iter__(self):
+        for row in self.rows.values():
+            yield ObjectRow(self, row)
+
+
+class ObjectRow:
+    """Read-only view of one ObjectTable row with GameObject-style attributes."""
+    __slots__ = ('table', 'row')
+
+    def __init__(self, table, row):
+        self.table = table
+        self.row = row
+
+    def __getattr__(self, name):
+        try:
+            return self.table.columns[name][self.row]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __repr__(self):
+        return f"ObjectRow(guid={self.guid}, type={self.type})"
@@ -0,0 +1,70 @@
+import time
+from layouts import NODE_LAYOUT
+
+# Upper bound on nodes visited per walk, guarding against a corrupted (cyclic) list
+MAX_OBJECTS = 0x10000
+
+
+class ObjectListWalker:
+    """Walks the client's object list once per tick and indexes it by guid.
+
+    Every query made during the same tick shares one pass over the list. A
+    walk is reused until begin_tick() is called or it is older than max_age
+    seconds, whichever comes first.
+    """
+
+    def __init__(self, memory_reader, first_object=None, max_age=0.1):
+        self.pm = memory_reader
+        self.first_object = first_object
+        self.max_age = max_age
+        self.entries = []
+        self.by_guid = {}
+        self.tick = 0
+        self.walk_count = 0
+        self._walked_tick = None
+        self._walked_at = 0.0
+        self._node = bytearray(NODE_LAYOUT.size)
+
+    def begin_tick(self):
+        """Starts a new tick; the next query re-walks the list."""
+        self.tick += 1
+
+    def walk(self, force=False):
+        """Walks the list unless this tick's walk is still current. Returns the entries."""
+        if not force and self._walked_tick == self.tick and \
+                time.perf_counter() - self._walked_at < self.max_age:
+            return self.entries
+
+        entries = []
+        by_guid = {}
+        current = self.first_object
+        node = self._node
+        read_into = self.pm.try_read_into
+        unpack_from = NODE_LAYOUT.unpack_from
+        while current and current % 2 == 0 and len(entries) < MAX_OBJECTS:
+            if not read_into(current, node):
+                break
+            obj_type, guid, next_object = unpack_from(node)
+            entries.append((current, guid, obj_type))
+            by_guid[guid] = current
+            current = next_object
+
+        self.entries = entries
+        self.by_guid = by_guid
+        self.walk_count += 1
+        self._walked_tick = self.tick
+        self._walked_at = time.perf_counter()
+        return entries
+
+    def get(self, guid):
+        """Returns the base address of the object with this guid, or 0."""
+        self.walk()
+        return self.by_guid.get(guid, 0)
+
+    def addresses(self):
+        """Returns the node addresses in list order."""
+        return [address for address, _, _ in self.walk()]
+
+    def of_type(self, obj_type):
+        """Returns (address, guid) pairs for every node of obj_type."""
+        return [(address, guid) for address, guid, node_type in self.walk() if node_type == obj_type]
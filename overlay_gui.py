@@ -9,6 +9,7 @@ import queue
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
 
 class OverlayGUI:
     def __init__(self, master, player_scan, spell_collection, d3d_hook):
@@ -102,6 +103,8 @@ class OverlayGUI:
 
     def update_gui(self):
         """Periodically updates the GUI with the latest player and party info."""
+        self.memory_reader.begin_tick()
+        self.player_scan.begin_tick()  # Player and party info share one object list walk
         self.update_player_info()
         self.update_party_info()
         self.master.after(1000, self.update_gui)  # Update every second
@@ -135,7 +138,7 @@ class OverlayGUI:
                 self.d3d_hook.queue_spell_cast(spell_id, target_guid)
             self.master.after(100, self.process_queue)
         except Exception as e:
-            logging.error(f"Error in processing spell cast queue: {e}")
+            logger.error("Error in processing spell cast queue: %s", e)
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -1,9 +1,18 @@
 import logging
+from collections import OrderedDict
 from offsets import Offsets
 from memory_reader import WoWMemoryReader
+from object_walker import ObjectListWalker
+from pointer_chain import object_manager_chain
 import ctypes
 
+logger = logging.getLogger(__name__)
+
+
 class WowObject:
+    __slots__ = ('guid', 'name', 'current_health', 'max_health',
+                 'x_pos', 'y_pos', 'z_pos', 'base_address')
+
     def __init__(self):
         self.guid = 0
         self.name = "Unknown"
@@ -20,17 +29,40 @@ class WowObject:
 
     def copy_from(self, other):
         """Copy data from another WowObject."""
-        self.guid = other.guid
-        self.name = other.name
-        self.current_health = other.current_health
-        self.max_health = other.max_health
-        self.x_pos = other.x_pos
-        self.y_pos = other.y_pos
-        self.z_pos = other.z_pos
-        self.base_address = other.base_address
+        for name in WowObject.__slots__:
+            setattr(self, name, getattr(other, name))
         return self
 
 
+class NameCache:
+    """Bounded LRU cache of guid -> player name."""
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.names = OrderedDict()
+
+    def __contains__(self, guid):
+        return guid in self.names
+
+    def __len__(self):
+        return len(self.names)
+
+    def get(self, guid):
+        name = self.names.get(guid)
+        if name is not None:
+            self.names.move_to_end(guid)
+        return name
+
+    def put(self, guid, name):
+        self.names[guid] = name
+        self.names.move_to_end(guid)
+        if len(self.names) > self.capacity:
+            self.names.popitem(last=False)
+
+    def clear(self):
+        self.names.clear()
+
+
 class PlayerScan:
     def __init__(self, memory_reader: WoWMemoryReader):
         self.pm = memory_reader
@@ -40,129 +72,203 @@ class PlayerScan:
         self.get_active_player = None
         self.get_active_player_obj = None
         self.current_players = []
+        self.walker = ObjectListWalker(memory_reader)
+        self.name_cache = NameCache()
+        self.zone_id = None
+        self.roots = object_manager_chain(memory_reader)
+        self.roots_generation = None
         self.load_addresses()
     
     def load_addresses(self):
-        client_connection = self.pm.read_uint(self.pm.base_address + Offsets.ObjectManager.StaticClientConnection - 0x400000)
-        object_manager = self.pm.read_uint(client_connection + Offsets.ObjectManager.ObjectManagerOffset)
-        self.first_object = self.pm.read_uint(object_manager + Offsets.ObjectManager.FirstObjectOffset)
-        self.local_guid = self.pm.read_uint64(object_manager + Offsets.ObjectManager.LocalGuidOffset)
-        self.get_active_player = self.pm.read_uint64(object_manager + Offsets.Globals.ClntObjMgrGetActivePlayer)
-        self.get_active_player_obj = self.pm.read_uint64(object_manager + Offsets.Globals.ClntObjMgrGetActivePlayerObj)
-        logging.info(f"Object Manager Base: {hex(object_manager)}, First Object: {hex(self.first_object)}")
+        """Refreshes the object list roots; cheap to call every tick thanks to the cached pointer chain."""
+        object_manager = self.roots.resolve()
+        if not object_manager:
+            self.first_object = None
+            self.walker.first_object = None
+            return
+        self.first_object, self.local_guid = self.pm.read_many([
+            (object_manager + Offsets.ObjectManager.FirstObjectOffset, 'I'),
+            (object_manager + Offsets.ObjectManager.LocalGuidOffset, 'Q'),
+        ])
+        self.walker.first_object = self.first_object
+        if self.roots.generation != self.roots_generation:
+            self.roots_generation = self.roots.generation
+            self.get_active_player = self.pm.read_uint64(object_manager + Offsets.Globals.ClntObjMgrGetActivePlayer)
+            self.get_active_player_obj = self.pm.read_uint64(object_manager + Offsets.Globals.ClntObjMgrGetActivePlayerObj)
+            logger.info("Object Manager Base: %#x, First Object: %#x", object_manager, self.first_object or 0)
 
     def get_local_player_name(self):
         player_name_address = self.pm.base_address + Offsets.Globals.PlayerName - 0x400000
-        logging.info(f"Reading player name from address: {hex(player_name_address)}")
+        logger.debug("Reading player name from address: %#x", player_name_address)
         player_name = self.pm.read_string(player_name_address)
-        logging.info(f"Player Name Retrieved: {player_name}")
+        logger.debug("Player Name Retrieved: %s", player_name)
         return player_name
 
+    def begin_tick(self):
+        """Starts a new refresh tick; the next query re-walks the object list once.
+
+        Also drops the reader's page cache, so the refresh never sees pages
+        cached during an earlier one.
+        """
+        self.pm.bump_epoch()
+        self.load_addresses()
+        self.walker.begin_tick()
+
     def get_local_player_health_mana(self):
-        current_object = self.first_object
-        while current_object != 0 and current_object % 2 == 0:
-            obj_guid = self.pm.read_uint64(current_object + Offsets.ObjectOffsets.Guid)
-            if obj_guid == self.local_guid:
-                unit_fields_address = self.pm.read_uint(current_object + Offsets.ObjectOffsets.UnitFields)
-                health = self.pm.read_int(unit_fields_address + Offsets.UnitOffsets.Health)
-                max_health = self.pm.read_int(unit_fields_address + Offsets.UnitOffsets.MaxHealth)
-                mana = self.pm.read_int(unit_fields_address + Offsets.UnitOffsets.Mana)
-                max_mana = self.pm.read_int(unit_fields_address + Offsets.UnitOffsets.MaxMana)
-                return health, max_health, mana, max_mana
-            current_object = self.pm.read_uint(current_object + Offsets.ObjectManager.NextObjectOffset)
+        current_object = self.get_object_base_by_guid(self.local_guid)
+        if current_object:
+            unit_fields_address = self.pm.read_uint(current_object + Offsets.ObjectOffsets.UnitFields)
+            if unit_fields_address:
+                return tuple(self.pm.read_many([
+                    (unit_fields_address + Offsets.UnitOffsets.Health, 'i'),
+                    (unit_fields_address + Offsets.UnitOffsets.MaxHealth, 'i'),
+                    (unit_fields_address + Offsets.UnitOffsets.Mana, 'i'),
+                    (unit_fields_address + Offsets.UnitOffsets.MaxMana, 'i'),
+                ]))
         return None, None, None, None
 
     def ping(self):
         """Refreshes local player data and visible objects."""
+        self.begin_tick()
         self.current_players.clear()
+        self.check_zone()
         self.local_player.base_address = self.get_object_base_by_guid(self.local_guid)
+        players = self.walker.of_type(Offsets.ObjectType.Player)
+
+        # One pass over the name store covers the local player and everyone visible;
+        # a guid it misses stays "Unknown" for this tick rather than being looked up again
+        guids = [guid for _, guid in players]
         if self.local_player.base_address != 0:
-            self.update_object_info(self.local_player, self.local_guid)
+            guids.append(self.local_guid)
+        names = self.resolve_player_names(guids)
+
+        if self.local_player.base_address != 0:
+            self.update_object_info(self.local_player, self.local_guid, names)
 
         # Populate current_players with visible player objects
-        current_object = self.first_object
-        while current_object != 0 and current_object % 2 == 0:
-            obj_type = self.pm.read_uint(current_object + Offsets.ObjectOffsets.Type)
-            if obj_type == 4:  # Player type
-                player = WowObject()
-                player.guid = self.pm.read_uint64(current_object + Offsets.ObjectOffsets.Guid)
-                player.name = self.get_player_name(player.guid)
-                self.update_object_info(player, player.guid)
-                self.current_players.append(player)
-            current_object = self.pm.read_uint(current_object + Offsets.ObjectManager.NextObjectOffset)
+        for address, guid in players:
+            player = WowObject()
+            player.guid = guid
+            player.base_address = address
+            self.update_object_info(player, guid, names)
+            self.current_players.append(player)
 
     def get_player_list(self):
         """Return a list of visible player objects."""
         return [player.clone() for player in self.current_players]
 
-    def update_object_info(self, obj, guid):
-        """Retrieve and update position and health details for a given object."""
-        obj.x_pos = self.pm.read_float(obj.base_address + Offsets.ObjectOffsets.Pos_X)
-        obj.y_pos = self.pm.read_float(obj.base_address + Offsets.ObjectOffsets.Pos_Y)
-        obj.z_pos = self.pm.read_float(obj.base_address + Offsets.ObjectOffsets.Pos_Z)
-        unit_fields = self.pm.read_uint(obj.base_address + Offsets.ObjectOffsets.UnitFields)
-        obj.current_health = self.pm.read_int(unit_fields + Offsets.UnitOffsets.Health)
-        obj.max_health = self.pm.read_int(unit_fields + Offsets.UnitOffsets.MaxHealth)
-        obj.name = self.get_player_name(guid)
+    def update_object_info(self, obj, guid, names=None):
+        """Retrieve and update position and health details for a given object.
+
+        names is a resolve_player_names() result; without one the name is
+        looked up on its own.
+        """
+        obj.x_pos, obj.y_pos, obj.z_pos, unit_fields = self.pm.read_many([
+            (obj.base_address + Offsets.ObjectOffsets.Pos_X, 'f'),
+            (obj.base_address + Offsets.ObjectOffsets.Pos_Y, 'f'),
+            (obj.base_address + Offsets.ObjectOffsets.Pos_Z, 'f'),
+            (obj.base_address + Offsets.ObjectOffsets.UnitFields, 'I'),
+        ])
+        obj.current_health, obj.max_health = self.pm.read_many([
+            (unit_fields + Offsets.UnitOffsets.Health, 'i'),
+            (unit_fields + Offsets.UnitOffsets.MaxHealth, 'i'),
+        ]) if unit_fields else (None, None)
+        obj.name = self.get_player_name(guid) if names is None else names.get(guid, "Unknown")
+
+    def check_zone(self):
+        """Clears the name cache when the zone id changes."""
+        zone_id = self.pm.read_uint(self.pm.base_address + Offsets.Globals.GetZoneID - 0x400000)
+        if zone_id != self.zone_id:
+            self.name_cache.clear()
+            self.zone_id = zone_id
 
     def get_player_name(self, guid):
         """Get player name by GUID."""
+        name = self.name_cache.get(guid)
+        if name is not None:
+            return name
+        return self.resolve_player_names([guid]).get(guid, "Unknown")
+
+    def resolve_player_names(self, guids):
+        """Resolves every uncached guid in one pass over the name-store buckets.
+
+        Returns a guid -> name dict of every name known, cached or found;
+        found names are cached.
+        """
+        resolved = {}
+        uncached = []
+        for guid in guids:
+            name = self.name_cache.get(guid)
+            if name is not None:
+                resolved[guid] = name
+            else:
+                uncached.append(guid)
+        if not uncached:
+            return resolved
+        buckets = {}
         try:
-            mask = self.pm.read_uint(Offsets.Globals.NameStorePointer + Offsets.Globals.nameMask)
-            base = self.pm.read_uint(Offsets.Globals.NameStorePointer + Offsets.Globals.nameBase)
-            short_guid = guid & 0xffffffff
-            offset = 12 * (mask & short_guid)
-            current = self.pm.read_uint(base + offset + 8)
-
-            while current != 0 and (current & 0x1) == 0:
-                if self.pm.read_uint(current) == short_guid:
-                    return self.pm.read_string(current + Offsets.Globals.nameString, 40)
-                current = self.pm.read_uint(current + 4)
-            return "Unknown"
+            mask, base = self.pm.read_many([
+                (Offsets.Globals.NameStorePointer + Offsets.Globals.nameMask, 'I'),
+                (Offsets.Globals.NameStorePointer + Offsets.Globals.nameBase, 'I'),
+            ])
+            if mask is None or not base:
+                return resolved
+            for guid in uncached:
+                short_guid = guid & 0xffffffff
+                buckets.setdefault(mask & short_guid, {})[short_guid] = guid
+
+            found = []
+            for bucket, pending in buckets.items():
+                current = self.pm.read_uint(base + 12 * bucket + 8)
+                while pending and current and (current & 0x1) == 0:
+                    guid = pending.pop(self.pm.read_uint(current), None)
+                    if guid is not None:
+                        found.append((guid, current + Offsets.Globals.nameString))
+                    current = self.pm.read_uint(current + 4)
+
+            names = self.pm.read_strings([address for _, address in found], 40)
+            for (guid, _), name in zip(found, names):
+                if name is not None:
+                    self.name_cache.put(guid, name)
+                    resolved[guid] = name
         except Exception as e:
-            logging.error(f"Error retrieving player name: {e}")
-            return "Unknown"
+            logger.error("Error retrieving player name: %s", e)
+        return resolved
 
     def get_object_base_by_guid(self, guid):
         """Finds the base address of an object by its GUID."""
-        temp_object_base = self.first_object
-        while temp_object_base != 0:
-            current_guid = self.pm.read_uint64(temp_object_base + Offsets.ObjectOffsets.Guid)
-            if current_guid == guid:
-                return temp_object_base
-            temp_object_base = self.pm.read_uint(temp_object_base + Offsets.ObjectManager.NextObjectOffset)
-        return 0
+        return self.walker.get(guid)
 
     def get_party_health(self):
         party_member_health = {}
 
         # Iterate over attributes in Offsets.Party
-        for member_name in dir(Offsets.Party):
-            if not member_name.startswith("__"):  # Skip special attributes
-                offset = getattr(Offsets.Party, member_name)
-                guid = self.pm.read_uint64(self.pm.base_address + offset - 0x400000)
-
-                # Start from the first object for each party member
-                current_object = self.first_object
-                while current_object != 0 and current_object % 2 == 0:
-                    obj_guid = self.pm.read_uint64(current_object + Offsets.ObjectOffsets.Guid)
-                    if guid == obj_guid:
-                        unit_fields_address = self.pm.read_uint(current_object + Offsets.ObjectOffsets.UnitFields)
-                        current_health = self.pm.read_int(unit_fields_address + Offsets.UnitOffsets.Health)
-                        max_health = self.pm.read_int(unit_fields_address + Offsets.UnitOffsets.MaxHealth)
-                        party_member_health[member_name] = (current_health, max_health)
-                        break  # Exit the loop once the matching GUID is found for this member
-                    current_object = self.pm.read_uint(current_object + Offsets.ObjectManager.NextObjectOffset)
+        member_names = [name for name in dir(Offsets.Party) if not name.startswith("__")]
+        guids = self.pm.read_many([
+            (self.pm.base_address + getattr(Offsets.Party, name) - 0x400000, 'Q')
+            for name in member_names
+        ])
+
+        # One shared walk of the object list resolves every member
+        for member_name, guid in zip(member_names, guids):
+            current_object = self.get_object_base_by_guid(guid)
+            if current_object:
+                unit_fields_address = self.pm.read_uint(current_object + Offsets.ObjectOffsets.UnitFields)
+                if unit_fields_address:
+                    party_member_health[member_name] = tuple(self.pm.read_many([
+                        (unit_fields_address + Offsets.UnitOffsets.Health, 'i'),
+                        (unit_fields_address + Offsets.UnitOffsets.MaxHealth, 'i'),
+                    ]))
 
         return party_member_health
 
     def get_local_player_guid(self):
-        logging.info("Calling get_local_player_guid")
+        logger.debug("Calling get_local_player_guid")
         try:
             local_guid_pointer = self.pm.base_address + Offsets.Globals.LocalGUID - 0x400000
             local_guid = self.pm.read_uint64(local_guid_pointer)
-            logging.info(f"Local Player GUID Retrieved: {local_guid}")
+            logger.debug("Local Player GUID Retrieved: %s", local_guid)
             return local_guid
         except Exception as e:
-            logging.error(f"Failed to retrieve Local Player GUID: {e}")
+            logger.error("Failed to retrieve Local Player GUID: %s", e)
             return None
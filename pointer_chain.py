@@ -0,0 +1,62 @@
+from offsets import Offsets
+
+
+class PointerChain:
+    """Caches a chain of pointer hops, re-resolving only when its anchor moves.
+
+    Each resolve() costs one read of the anchor pointer and, when given, the
+    generation flag (e.g. Globals.IsLoadingOrConnecting). The remaining hops
+    are re-read only when either value changes, which bumps generation.
+    While the flag is set the chain is treated as invalid and resolves to None.
+    """
+
+    def __init__(self, memory_reader, anchor_address, offsets, generation_address=None):
+        self.pm = memory_reader
+        self.anchor_address = anchor_address
+        self.offsets = list(offsets)
+        self.generation_address = generation_address
+        self.generation = 0
+        self.hops = None
+        self._key = None
+
+    def invalidate(self):
+        """Forces the next resolve() to re-walk every hop."""
+        self._key = None
+
+    def resolve(self):
+        """Returns the address the chain ends at, or None if it cannot be resolved."""
+        if self.generation_address is None:
+            anchor, flag = self.pm.read_uint(self.anchor_address), 0
+        else:
+            anchor, flag = self.pm.read_many([(self.anchor_address, 'I'), (self.generation_address, 'I')])
+        if not anchor or flag:
+            self._key = None
+            self.hops = None
+            return None
+
+        key = (anchor, flag)
+        if key != self._key:
+            self.hops = self._walk(anchor)
+            self._key = key if self.hops is not None else None
+            self.generation += 1
+        return self.hops[-1] if self.hops else None
+
+    def _walk(self, anchor):
+        hops = [anchor]
+        value = anchor
+        for offset in self.offsets:
+            value = self.pm.read_uint(value + offset)
+            if not value:
+                return None
+            hops.append(value)
+        return hops
+
+
+def object_manager_chain(memory_reader):
+    """StaticClientConnection -> ObjectManagerOffset, invalidated across loading screens."""
+    return PointerChain(
+        memory_reader,
+        memory_reader.base_address + Offsets.ObjectManager.StaticClientConnection - 0x400000,
+        [Offsets.ObjectManager.ObjectManagerOffset],
+        generation_address=memory_reader.base_address + Offsets.Globals.IsLoadingOrConnecting - 0x400000,
+    )
@@ -0,0 +1,140 @@
+import heapq
+import math
+
+
+class SpatialGrid:
+    """Uniform 2D grid over object positions for radius, nearest and cone queries.
+
+    Objects are bucketed by (x, y) cell; z only takes part in the distance
+    check. update() moves an object between cells only when it crosses a
+    cell boundary, so refreshing a tick's positions is cheap.
+    """
+
+    def __init__(self, cell_size=20.0):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.positions = {}
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __contains__(self, guid):
+        return guid in self.positions
+
+    def _cell(self, x, y):
+        return (int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size)))
+
+    def update(self, guid, x, y, z):
+        """Inserts guid or moves it to (x, y, z)."""
+        cell = self._cell(x, y)
+        previous = self.positions.get(guid)
+        if previous is not None and previous[3] != cell:
+            self._discard(guid, previous[3])
+            previous = None
+        if previous is None:
+            self.cells.setdefault(cell, set()).add(guid)
+        self.positions[guid] = (x, y, z, cell)
+
+    def remove(self, guid):
+        previous = self.positions.pop(guid, None)
+        if previous is not None:
+            self._discard(guid, previous[3])
+
+    def _discard(self, guid, cell):
+        members = self.cells[cell]
+        members.discard(guid)
+        if not members:
+            del self.cells[cell]
+
+    def retain(self, guids):
+        """Removes every guid not in guids."""
+        for guid in [guid for guid in self.positions if guid not in guids]:
+            self.remove(guid)
+
+    def update_from(self, objects):
+        """Updates positions from objects with guid/x_pos/y_pos/z_pos attributes."""
+        for obj in objects:
+            if obj.x_pos is not None:
+                self.update(obj.guid, obj.x_pos, obj.y_pos, obj.z_pos)
+
+    def clear(self):
+        self.cells.clear()
+        self.positions.clear()
+
+    def _candidates(self, x, y, radius):
+        min_x, min_y = self._cell(x - radius, y - radius)
+        max_x, max_y = self._cell(x + radius, y + radius)
+        if (max_x - min_x + 1) * (max_y - min_y + 1) > len(self.cells):
+            # Radius spans more cells than are occupied; scan occupied cells only
+            for (cx, cy), members in self.cells.items():
+                if min_x <= cx <= max_x and min_y <= cy <= max_y:
+                    yield from members
+            return
+        for cx in range(min_x, max_x + 1):
+            for cy in range(min_y, max_y + 1):
+                members = self.cells.get((cx, cy))
+                if members:
+                    yield from members
+
+    def _distance(self, guid, x, y, z):
+        px, py, pz, _ = self.positions[guid]
+        return math.sqrt((px - x) ** 2 + (py - y) ** 2 + (pz - z) ** 2)
+
+    def within(self, x, y, z, radius):
+        """Returns (distance, guid) pairs within radius of (x, y, z), nearest first."""
+        found = []
+        for guid in self._candidates(x, y, radius):
+            distance = self._distance(guid, x, y, z)
+            if distance <= radius:
+                found.append((distance, guid))
+        found.sort()
+        return found
+
+    def nearest(self, x, y, z, count=1, max_radius=None):
+        """Returns up to count (distance, guid) pairs closest to (x, y, z), nearest first."""
+        if not self.positions or count <= 0:
+            return []
+        center_x, center_y = self._cell(x, y)
+        extent = max(max(abs(cx - center_x), abs(cy - center_y)) for cx, cy in self.cells)
+        heap = []
+        ring = 0
+        while ring <= extent:
+            for cell in self._ring(center_x, center_y, ring):
+                for guid in self.cells.get(cell, ()):
+                    heap.append((self._distance(guid, x, y, z), guid))
+            # Every point closer than this has been visited
+            covered = ring * self.cell_size
+            if max_radius is not None and covered >= max_radius:
+                break
+            if len(heap) >= count and heapq.nsmallest(count, heap)[-1][0] <= covered:
+                break
+            ring += 1
+        found = heapq.nsmallest(count, heap)
+        if max_radius is not None:
+            found = [pair for pair in found if pair[0] <= max_radius]
+        return found
+
+    @staticmethod
+    def _ring(center_x, center_y, ring):
+        if ring == 0:
+            yield (center_x, center_y)
+            return
+        for cx in range(center_x - ring, center_x + ring + 1):
+            yield (cx, center_y - ring)
+            yield (cx, center_y + ring)
+        for cy in range(center_y - ring + 1, center_y + ring):
+            yield (center_x - ring, cy)
+            yield (center_x + ring, cy)
+
+    def cone(self, x, y, z, facing, half_angle, radius):
+        """Returns (distance, guid) pairs within radius whose bearing is within half_angle of facing."""
+        found = []
+        for distance, guid in self.within(x, y, z, radius):
+            px, py, _, _ = self.positions[guid]
+            if px == x and py == y:
+                continue
+            bearing = math.atan2(py - y, px - x)
+            delta = abs((bearing - facing + math.pi) % (2 * math.pi) - math.pi)
+            if delta <= half_angle:
+                found.append((distance, guid))
+        return found
@@ -9,6 +9,7 @@ from lua import WoWLuaEngine
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
 
 # Direct3D Offsets
 class Direct3D9:
@@ -53,7 +54,7 @@ class SpellCollection:
             
             # Define correct function prototype
             # __stdcall convention, void return type, takes spell ID and optionally target GUID
-            SPELL_FUNC = ctypes.WINFUNCTYPE(
+            SPELL_FUNC = getattr(ctypes, 'WINFUNCTYPE', ctypes.CFUNCTYPE)(
                 None,            # Return type (void)
                 ctypes.c_uint32, # Spell ID
                 ctypes.c_char_p  # Target GUID (optional)
@@ -61,16 +62,16 @@ class SpellCollection:
             
             # Create delegate
             self.cast_spell_delegate = SPELL_FUNC(cast_spell_addr)
-            logging.info(f"Spell casting delegate initialized at {hex(cast_spell_addr)}")
+            logger.info("Spell casting delegate initialized at %#x", cast_spell_addr)
             
         except Exception as e:
-            logging.error(f"Failed to initialize spell delegates: {e}")
+            logger.error("Failed to initialize spell delegates: %s", e)
             raise
     
     def cast_spell(self, spell_id: int, target_guid: str = None) -> bool:
         try:
             if self.cast_spell_delegate is None:
-                logging.error("Spell delegate not initialized")
+                logger.error("Spell delegate not initialized")
                 return False
     
             # Convert spell_id to unsigned 32-bit int
@@ -81,11 +82,11 @@ class SpellCollection:
             
             # Call the function
             self.cast_spell_delegate(spell_id, target)
-            logging.info(f"Cast spell {spell_id.value} {f'on {target_guid}' if target_guid else ''}")
+            logger.info("Cast spell %s%s", spell_id.value, f" on {target_guid}" if target_guid else "")
             return True
             
         except Exception as e:
-            logging.error(f"Failed to cast spell {spell_id}: {e}")
+            logger.error("Failed to cast spell %s: %s", spell_id, e)
             return False
 
 
@@ -93,7 +94,7 @@ class SpellCollection:
         try:
             return func_type(address)
         except Exception as e:
-            logging.error(f"Failed to register delegate at {hex(address)}: {e}")
+            logger.error("Failed to register delegate at %#x: %s", address, e)
             raise
 
     def update_known_spells(self):
@@ -102,21 +103,21 @@ class SpellCollection:
         try:
             spell_count = self.pm.read_int(Offsets.Spell.SpellCount)
             if spell_count <= 0:
-                logging.warning("No spells found in spellbook")
+                logger.warning("No spells found in spellbook")
                 return
             
             known_spells = []
             for i in range(spell_count):
                 spell_id = self.pm.read_uint(Offsets.Spell.SpellBook + (i * 4))
                 known_spells.append(Spell(spell_id))
-                logging.info(f"Added Spell: ID {spell_id}")
+                logger.debug("Added Spell: ID %s", spell_id)
                 
             if known_spells:
                 self.known_spells = known_spells
-                logging.info(f"SpellBook: {len(self.known_spells)} spells loaded")
+                logger.info("SpellBook: %s spells loaded", len(self.known_spells))
             self.update = False
         except Exception as e:
-            logging.warning(f"Failed to update known spells: {e}")
+            logger.warning("Failed to update known spells: %s", e)
 
     def is_spell_ready(self, spell_id):
         try:
@@ -145,13 +146,13 @@ class SpellCollection:
     def has_spell(self, spell_identifier):
         if isinstance(spell_identifier, int):
             return any(spell.id == spell_identifier for spell in self.known_spells)
-        logging.error("Spell identifier must be an int (spell ID)")
+        logger.error("Spell identifier must be an int (spell ID)")
         return False
 
     def __getitem__(self, key):
         if isinstance(key, int):
             return next((spell for spell in self.known_spells if spell.id == key), None)
-        logging.error("Key must be an int (spell ID)")
+        logger.error("Key must be an int (spell ID)")
         return None
 
 class D3DHook:
@@ -169,22 +170,22 @@ class D3DHook:
         try:
             pDeviceBase = self.memory_reader.read_uint(Direct3D9.pDevicePtr_1)
             if not pDeviceBase:
-                logging.error("Failed to read base device pointer")
+                logger.error("Failed to read base device pointer")
                 return None
             return pDeviceBase
         except Exception as e:
-            logging.error(f"Error reading device pointer: {e}")
+            logger.error("Error reading device pointer: %s", e)
             return None
 
     def hook_end_scene(self) -> None:
         if not self.device_pointer:
-            logging.error("Direct3D device pointer is not initialized")
+            logger.error("Direct3D device pointer is not initialized")
             return
 
         end_scene_address = self.memory_reader.read_uint(
             self.device_pointer + Direct3D9.oEndScene
         )
-        logging.info(f"Original EndScene address: {hex(end_scene_address)}")
+        logger.info("Original EndScene address: %#x", end_scene_address)
 
         self.original_end_scene = ctypes.cast(
             end_scene_address, 
@@ -198,9 +199,9 @@ class D3DHook:
                 try:
                     self.spell_caster.Spell_C_Cast_Delegate(1082, 0)
                     self.last_cast_time = current_time
-                    logging.info("Test spell 1082 cast attempted")
+                    logger.info("Test spell 1082 cast attempted")
                 except Exception as e:
-                    logging.error(f"Failed to cast test spell: {e}")
+                    logger.error("Failed to cast test spell: %s", e)
             return self.original_end_scene()
 
         self.hooked_end_scene = hooked_end_scene
@@ -208,7 +209,7 @@ class D3DHook:
             self.device_pointer + Direct3D9.oEndScene,
             ctypes.cast(self.hooked_end_scene, ctypes.c_void_p).value
         )
-        logging.info("EndScene hooked successfully with test spell casting")
+        logger.info("EndScene hooked successfully with test spell casting")
 
     def unhook_end_scene(self) -> None:
         if self.original_end_scene and self.device_pointer:
@@ -216,14 +217,14 @@ class D3DHook:
                 self.device_pointer + Direct3D9.oEndScene,
                 ctypes.cast(self.original_end_scene, ctypes.c_void_p).value
             )
-            logging.info("EndScene unhooked successfully")
+            logger.info("EndScene unhooked successfully")
 
     def queue_spell_cast(self, spell_id: int, target: int) -> None:
         self.spell_cast_queue.append((spell_id, target))
-        logging.info(f"Queued spell cast for ID {spell_id} on target {target}")
+        logger.info("Queued spell cast for ID %s on target %s", spell_id, target)
 
     def execute_main_thread_functions(self) -> None:
         while self.spell_cast_queue:
             spell_id, target = self.spell_cast_queue.pop(0)
-            logging.info(f"Executing spell cast for ID {spell_id} on target {target}")
+            logger.info("Executing spell cast for ID %s on target %s", spell_id, target)
             self.spell_caster.Spell_C_Cast_Delegate(spell_id, target)
\ No newline at end of file
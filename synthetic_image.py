@@ -0,0 +1,222 @@
+"""Synthetic game-memory images built from declarative scenarios.
+
+build_image(Scenario(players=40, npcs=200, party=4)) lays out a client
+connection, object manager, linked object nodes, unit descriptors, a name
+store hash table, the spellbook and a spell cooldown list at the exact
+Offsets layout, and returns a SyntheticImage whose backend can stand in for
+the live process in benchmarks and scaling tests.
+"""
+import random
+import struct
+
+from memory_reader import MemoryImageBackend
+from object_manager import OBJECT_HEADER_SIZE, UNIT_FIELDS_SIZE
+from offsets import Offsets
+
+# Static globals (client connection, party, name store, spellbook, ...) live in this range
+STATIC_START = 0xB00000
+STATIC_END = 0xD50000
+HEAP_START = 0x10000000
+NAME_ENTRY_SIZE = 0x60
+COOLDOWN_ENTRY_SIZE = 0x28
+PARTY_SLOTS = (Offsets.Party.Member1GUID, Offsets.Party.Member2GUID,
+               Offsets.Party.Member3GUID, Offsets.Party.Member4GUID)
+
+
+class Scenario:
+    """Declarative description of a world to lay out in memory.
+
+    players and npcs count visible units; the first player is the local
+    player. party is how many other players fill the party slots (max 4).
+    cooldowns is a list of (spell_id, start_ms, duration_ms). Positions are
+    scattered within spread yards of the origin using seed.
+    """
+
+    def __init__(self, players=1, npcs=0, party=0, known_spells=(), cooldowns=(),
+                 player_name="Synthetic", zone_id=1, name_buckets=0x400, spread=200.0, seed=0):
+        if party > min(len(PARTY_SLOTS), max(players - 1, 0)):
+            raise ValueError("party needs that many non-local players")
+        self.players = players
+        self.npcs = npcs
+        self.party = party
+        self.known_spells = list(known_spells)
+        self.cooldowns = list(cooldowns)
+        self.player_name = player_name
+        self.zone_id = zone_id
+        self.name_buckets = name_buckets
+        self.spread = spread
+        self.seed = seed
+
+
+class SyntheticImage:
+    """A built image plus the addresses needed to inspect or mutate it."""
+
+    def __init__(self, backend, heap):
+        self.backend = backend
+        self.heap = heap
+        self.nodes = {}
+        self.unit_fields = {}
+        self.players = []
+        self.npcs = []
+        self.party = []
+        self.local_guid = None
+        self.object_manager = 0
+        self.first_object = 0
+
+    def _pack(self, fmt, address, *values):
+        struct.pack_into(fmt, self.heap, address - HEAP_START, *values)
+
+    def move(self, guid, x, y, z):
+        node = self.nodes[guid]
+        self._pack('<f', node + Offsets.ObjectOffsets.Pos_X, x)
+        self._pack('<f', node + Offsets.ObjectOffsets.Pos_Y, y)
+        self._pack('<f', node + Offsets.ObjectOffsets.Pos_Z, z)
+
+    def set_health(self, guid, health):
+        self._pack('<i', self.unit_fields[guid] + Offsets.UnitOffsets.Health, health)
+
+    def unlink(self, guid):
+        """Removes guid's node from the object list, as when a unit leaves view."""
+        target = self.nodes[guid]
+        following = self.backend.read_bytes(target + Offsets.ObjectManager.NextObjectOffset, 4)
+        previous = None
+        for node in self.nodes.values():
+            next_bytes = self.backend.read_bytes(node + Offsets.ObjectManager.NextObjectOffset, 4)
+            if struct.unpack('<I', next_bytes)[0] == target:
+                previous = node
+                break
+        if previous is None:
+            self.first_object = struct.unpack('<I', following)[0]
+            self.backend.write_bytes(self.object_manager + Offsets.ObjectManager.FirstObjectOffset, following)
+        else:
+            self.backend.write_bytes(previous + Offsets.ObjectManager.NextObjectOffset, following)
+        del self.nodes[guid]
+
+    def set_loading(self, loading):
+        self.backend.write_bytes(Offsets.Globals.IsLoadingOrConnecting, struct.pack('<I', int(loading)))
+
+
+class _Arena:
+    """Bump allocator over the heap region."""
+
+    def __init__(self, start):
+        self.next = start
+
+    def alloc(self, size, align=0x10):
+        address = (self.next + align - 1) & ~(align - 1)
+        self.next = address + size
+        return address
+
+
+def _heap_size(scenario):
+    units = scenario.players + scenario.npcs
+    size = (0x4000
+            + units * (OBJECT_HEADER_SIZE + UNIT_FIELDS_SIZE + 0x20)
+            + scenario.players * NAME_ENTRY_SIZE
+            + scenario.name_buckets * 12
+            + len(scenario.cooldowns) * COOLDOWN_ENTRY_SIZE + 0x1000)
+    # Whole pages, so page-granular readers (captures, page cache) can read every byte
+    return (size + 0xFFF) & ~0xFFF
+
+
+def build_image(scenario):
+    """Lays out scenario in a MemoryImageBackend and returns a SyntheticImage.
+
+    The image uses the default module base (0x400000), so rebased and absolute
+    Offsets addresses coincide just as they do for the unrelocated client.
+    """
+    backend = MemoryImageBackend()
+    static = backend.add_region(STATIC_START, bytearray(STATIC_END - STATIC_START))
+    heap = backend.add_region(HEAP_START, bytearray(_heap_size(scenario)))
+    image = SyntheticImage(backend, heap)
+    arena = _Arena(HEAP_START)
+    rng = random.Random(scenario.seed)
+
+    def put(fmt, address, *values):
+        struct.pack_into(fmt, static, address - STATIC_START, *values)
+
+    put_heap = image._pack
+
+    # Client connection -> object manager
+    client_connection = arena.alloc(Offsets.ObjectManager.ObjectManagerOffset + 4)
+    object_manager = arena.alloc(0x100)
+    image.object_manager = object_manager
+    put('<I', Offsets.ObjectManager.StaticClientConnection, client_connection)
+    put_heap('<I', client_connection + Offsets.ObjectManager.ObjectManagerOffset, object_manager)
+
+    # Object list: local player at the head, every other unit in seeded random order
+    kinds = [Offsets.ObjectType.Player] * scenario.players + [Offsets.ObjectType.NPC] * scenario.npcs
+    if kinds:
+        rest = kinds[1:]
+        rng.shuffle(rest)
+        kinds = kinds[:1] + rest
+    previous = None
+    for index, obj_type in enumerate(kinds):
+        guid = (0x0000000000000001 if obj_type == Offsets.ObjectType.Player else 0xF130000000000000) + index
+        node = arena.alloc(OBJECT_HEADER_SIZE)
+        fields = arena.alloc(UNIT_FIELDS_SIZE)
+        put_heap('<I', node + Offsets.ObjectOffsets.UnitFields, fields)
+        put_heap('<i', node + Offsets.ObjectOffsets.Type, obj_type)
+        put_heap('<Q', node + Offsets.ObjectOffsets.Guid, guid)
+        image.nodes[guid] = node
+        image.unit_fields[guid] = fields
+        image.move(guid, rng.uniform(-scenario.spread, scenario.spread),
+                   rng.uniform(-scenario.spread, scenario.spread), rng.uniform(-10.0, 10.0))
+        put_heap('<f', node + Offsets.ObjectOffsets.Rot, rng.uniform(0.0, 6.28))
+        max_health = rng.randint(5000, 30000)
+        put_heap('<i', fields + Offsets.UnitOffsets.Health, rng.randint(1, max_health))
+        put_heap('<i', fields + Offsets.UnitOffsets.MaxHealth, max_health)
+        put_heap('<i', fields + Offsets.UnitOffsets.Mana, 10000)
+        put_heap('<i', fields + Offsets.UnitOffsets.MaxMana, 10000)
+        put_heap('<i', fields + Offsets.UnitOffsets.Level, rng.randint(1, 80))
+        if previous is None:
+            image.first_object = node
+        else:
+            put_heap('<I', previous + Offsets.ObjectManager.NextObjectOffset, node)
+        previous = node
+        (image.players if obj_type == Offsets.ObjectType.Player else image.npcs).append(guid)
+
+    put_heap('<I', object_manager + Offsets.ObjectManager.FirstObjectOffset, image.first_object)
+    image.local_guid = image.players[0] if image.players else 0
+    put_heap('<Q', object_manager + Offsets.ObjectManager.LocalGuidOffset, image.local_guid)
+    put('<Q', Offsets.Globals.LocalGUID, image.local_guid)
+
+    # Party slots hold the players right after the local player
+    image.party = image.players[1:1 + scenario.party]
+    for slot, guid in zip(PARTY_SLOTS, image.party):
+        put('<Q', slot, guid)
+
+    # Name store: mask/base header and 12-byte buckets chaining entries at +4
+    mask = scenario.name_buckets - 1
+    buckets = arena.alloc(scenario.name_buckets * 12)
+    put('<I', Offsets.Globals.NameStorePointer + Offsets.Globals.nameMask, mask)
+    put('<I', Offsets.Globals.NameStorePointer + Offsets.Globals.nameBase, buckets)
+    for guid in image.players:
+        short_guid = guid & 0xffffffff
+        entry = arena.alloc(NAME_ENTRY_SIZE)
+        head = buckets + 12 * (mask & short_guid) + 8
+        chain = struct.unpack_from('<I', heap, head - HEAP_START)[0]
+        put_heap('<II', entry, short_guid, chain or 1)  # An odd pointer ends the chain
+        put_heap('<I', head, entry)
+        name = (scenario.player_name if guid == image.local_guid else f"Player{guid}").encode()[:39]
+        start = entry + Offsets.Globals.nameString - HEAP_START
+        heap[start:start + len(name)] = name
+
+    player_name = scenario.player_name.encode()[:39]
+    start = Offsets.Globals.PlayerName - STATIC_START
+    static[start:start + len(player_name)] = player_name
+    put('<I', Offsets.Globals.GetZoneID, scenario.zone_id)
+
+    # Spellbook and cooldown list (entries link through +4, list head at SpellCooldownPtr + 8)
+    put('<i', Offsets.Spell.SpellCount, len(scenario.known_spells))
+    for index, spell_id in enumerate(scenario.known_spells):
+        put('<I', Offsets.Spell.SpellBook + index * 4, spell_id)
+    next_entry = 1
+    for spell_id, start_ms, duration_ms in reversed(scenario.cooldowns):
+        entry = arena.alloc(COOLDOWN_ENTRY_SIZE)
+        put_heap('<II', entry + 4, next_entry, spell_id)
+        put_heap('<Ii', entry + 0x10, start_ms, duration_ms)
+        next_entry = entry
+    put('<I', Offsets.Globals.SpellCooldownPtr + 0x8, next_entry if scenario.cooldowns else 0)
+
+    return image
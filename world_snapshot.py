@@ -0,0 +1,120 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:  # snapshots are optional; everything else works without numpy
+    np = None
+
+# Structured dtype of one snapshot row
+SNAPSHOT_FIELDS = [
+    ('guid', '<u8'),
+    ('type', '<i4'),
+    ('x', '<f4'),
+    ('y', '<f4'),
+    ('z', '<f4'),
+    ('rot', '<f4'),
+    ('health', '<i4'),
+    ('max_health', '<i4'),
+    ('level', '<i4'),
+]
+
+# Snapshot field -> ObjectTable column
+TABLE_COLUMNS = {
+    'guid': 'guid',
+    'type': 'type',
+    'x': 'x_pos',
+    'y': 'y_pos',
+    'z': 'z_pos',
+    'rot': 'rotation',
+    'health': 'health',
+    'max_health': 'max_health',
+    'level': 'level',
+}
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("numpy is required for world snapshots")
+
+
+def snapshot_from_table(table):
+    """Copies the live rows of an ObjectTable into a NumPy structured array."""
+    _require_numpy()
+    rows = np.fromiter(table.live_rows(), dtype=np.intp, count=len(table))
+    data = np.empty(len(rows), dtype=SNAPSHOT_FIELDS)
+    for field, column_name in TABLE_COLUMNS.items():
+        column = table.columns[column_name]
+        data[field] = np.frombuffer(column, dtype=column.typecode, count=len(column))[rows]
+    return data
+
+
+class WorldSnapshot:
+    """Vectorized queries over one tick's objects.
+
+    Every filter works on the whole population at once and returns a new
+    WorldSnapshot, so filters chain: snapshot.of_type(3).within(x, y, z, 30).
+    """
+
+    def __init__(self, data):
+        _require_numpy()
+        self.data = data
+
+    @classmethod
+    def from_table(cls, table):
+        return cls(snapshot_from_table(table))
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, field):
+        return self.data[field]
+
+    def where(self, mask):
+        """Returns the rows selected by a boolean mask."""
+        return WorldSnapshot(self.data[mask])
+
+    def of_type(self, obj_type):
+        return self.where(self.data['type'] == obj_type)
+
+    def distances(self, x, y, z):
+        """Euclidean distance from (x, y, z) to every row."""
+        dx = self.data['x'] - x
+        dy = self.data['y'] - y
+        dz = self.data['z'] - z
+        return np.sqrt(dx * dx + dy * dy + dz * dz)
+
+    def within(self, x, y, z, radius):
+        """Rows within radius yards of (x, y, z)."""
+        return self.where(self.distances(x, y, z) <= radius)
+
+    def in_front(self, x, y, facing, half_angle=math.pi / 2):
+        """Rows whose bearing from (x, y) is within half_angle radians of facing."""
+        bearing = np.arctan2(self.data['y'] - y, self.data['x'] - x)
+        delta = np.abs((bearing - facing + math.pi) % (2 * math.pi) - math.pi)
+        return self.where(delta <= half_angle)
+
+    def health_percent(self):
+        """Health as a percentage of max health; 0 where max health is unknown."""
+        max_health = self.data['max_health'].astype(np.float32)
+        percent = np.zeros(len(self.data), dtype=np.float32)
+        np.divide(self.data['health'] * 100.0, max_health, out=percent, where=max_health > 0)
+        return percent
+
+    def below_health(self, percent):
+        """Rows at or below the given health percentage."""
+        return self.where(self.health_percent() <= percent)
+
+    def alive(self):
+        return self.where(self.data['health'] > 0)
+
+    def nearest(self, x, y, z, count=1):
+        """The count rows closest to (x, y, z), nearest first."""
+        distances = self.distances(x, y, z)
+        count = min(count, len(distances))
+        if count == 0:
+            return self.where(np.zeros(0, dtype=np.intp))
+        order = np.argpartition(distances, count - 1)[:count]
+        return WorldSnapshot(self.data[order[np.argsort(distances[order])]])
+
+    def guids(self):
+        return self.data['guid'].tolist()